@@ -4,17 +4,25 @@ Cyra AI Assistant - Main FastAPI Application (No Speech Version)
 import asyncio
 import logging
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect
+from pathlib import Path
+from typing import List
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from datetime import datetime
-import uvicorn
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+import httpx
+import orjson
 
+from src.core.cache import LRUCache, message_cache_key
 from src.core.config import get_settings
+from src.core.middleware import ServerTimingMiddleware
+from src.core.static_page import StaticPage
 from src.core.ai_brain import AIBrain
 from src.tools.tool_manager import ToolManager
 
@@ -25,8 +33,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Security
-security = HTTPBearer()
+# Static assets for the web interface
+STATIC_DIR = Path(__file__).parent / "static"
 
 # Pydantic models
 class ChatMessage(BaseModel):
@@ -35,9 +43,9 @@ class ChatMessage(BaseModel):
 
 class ChatResponse(BaseModel):
     response: str
-    tool_calls: List[dict] = []
+    tool_calls: List[dict] = Field(default_factory=list)
     conversation_id: int
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class PasswordRequest(BaseModel):
     length: int = 16
@@ -48,26 +56,71 @@ class PasswordRequest(BaseModel):
     exclude_ambiguous: bool = False
     count: int = 1
 
+# Arguments for the common case of a request that leaves every option at its default
+_DEFAULT_PWD_KWARGS = PasswordRequest().model_dump()
+
 class PasswordStrengthRequest(BaseModel):
     password: str
 
-# Global instances
+# Global instances. Endpoints read these module globals directly (one lookup,
+# no Depends resolution per request); they are mirrored on app.state in
+# lifespan so tests can inspect or swap them.
 ai_brain: AIBrain = None
 tool_manager: ToolManager = None
-active_connections: List[WebSocket] = []
+
+# Recent answers to repeated questions, keyed by the normalized message
+response_cache: LRUCache = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
-    global ai_brain, tool_manager
+    global ai_brain, tool_manager, response_cache
     
     # Startup
     logger.info("🚀 Starting Cyra AI Assistant...")
     
+    # Let coroutines that finish without suspending (cache hits, /health)
+    # complete inline instead of taking a trip through the scheduler.
+    # asyncio.eager_task_factory is only available on Python 3.12+.
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
+    # Size the executor for blocking tool work to the machine instead of
+    # asyncio's min(32, cpu + 4) default. Hot sync calls with no contextvars
+    # should use loop.run_in_executor(None, ...) rather than asyncio.to_thread,
+    # which copies the current context on every call.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max(4, os.cpu_count() or 1), thread_name_prefix="cyra-tool")
+    )
+    
     try:
-        ai_brain = AIBrain()
+        # One pooled HTTP/2 client for all outbound LLM calls
+        app.state.http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=30.0
+        )
+        ai_brain = AIBrain(http_client=app.state.http)
         tool_manager = ToolManager()
+        app.state.ai_brain = ai_brain
+        app.state.tool_manager = tool_manager
         logger.info("✅ Core services initialized successfully")
+        
+        # Read, minify and compress the main interface once and keep it ready to serve
+        app.state.index_page = StaticPage(STATIC_DIR / "simple" / "index.html", max_age=3600)
+        
+        response_cache = LRUCache(maxsize=1024)
+        
+        # Services are fixed from here on, so the health payload is too
+        app.state.health_body = orjson.dumps({
+            "status": "healthy",
+            "services": {
+                "ai_brain": ai_brain is not None,
+                "tool_manager": tool_manager is not None,
+                "speech_service": False  # Disabled for now
+            },
+            "message": "Cyra AI Assistant is running (Speech services disabled)"
+        })
             
     except Exception as e:
         logger.error(f"❌ Failed to initialize core services: {e}")
@@ -77,15 +130,23 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🛑 Shutting down Cyra AI Assistant...")
+    await app.state.http.aclose()
 
 # Create FastAPI app
 app = FastAPI(
     title="Cyra AI Assistant",
     description="A sophisticated AI-powered cybersecurity assistant",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Per-request timing, as plain ASGI middleware rather than @app.middleware("http")
+app.add_middleware(ServerTimingMiddleware)
+
+# Compress larger chat and tool responses; already-encoded responses are left alone
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -95,431 +156,80 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Single catch-all for route errors instead of try/except in every endpoint"""
+    logger.error("Unhandled error on %s: %s", request.url.path, exc)
+    return ORJSONResponse({"detail": "internal error"}, status_code=500)
+
+# Stylesheet and script for the main interface
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
 @app.get("/", response_class=HTMLResponse)
-async def read_root():
+async def read_root(request: Request):
     """Serve the main interface"""
-    return """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Cyra AI Assistant</title>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <style>
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            
-            body {
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                min-height: 100vh;
-            }
-            
-            .container {
-                max-width: 1200px;
-                margin: 0 auto;
-                padding: 20px;
-                min-height: 100vh;
-                display: flex;
-                flex-direction: column;
-            }
-            
-            .header {
-                text-align: center;
-                padding: 30px 0;
-                backdrop-filter: blur(10px);
-                background: rgba(255,255,255,0.1);
-                border-radius: 20px;
-                margin-bottom: 30px;
-            }
-            
-            .header h1 {
-                font-size: 3rem;
-                margin-bottom: 10px;
-                text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-            }
-            
-            .header p {
-                font-size: 1.2rem;
-                opacity: 0.9;
-            }
-            
-            .main-content {
-                display: grid;
-                grid-template-columns: 1fr 400px;
-                gap: 30px;
-                flex: 1;
-            }
-            
-            .chat-section {
-                background: rgba(255,255,255,0.95);
-                color: #333;
-                border-radius: 20px;
-                padding: 30px;
-                display: flex;
-                flex-direction: column;
-                box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            }
-            
-            .chat-container {
-                flex: 1;
-                overflow-y: auto;
-                margin-bottom: 20px;
-                padding: 20px;
-                background: #f8f9fa;
-                border-radius: 15px;
-                min-height: 400px;
-            }
-            
-            .message {
-                margin: 15px 0;
-                padding: 15px 20px;
-                border-radius: 20px;
-                max-width: 80%;
-                animation: fadeIn 0.3s ease-in;
-            }
-            
-            .user-message {
-                background: linear-gradient(135deg, #667eea, #764ba2);
-                color: white;
-                margin-left: auto;
-                text-align: right;
-            }
-            
-            .bot-message {
-                background: white;
-                color: #333;
-                border: 2px solid #e9ecef;
-                margin-right: auto;
-            }
-            
-            .input-container {
-                display: flex;
-                gap: 15px;
-                align-items: stretch;
-            }
-            
-            .message-input {
-                flex: 1;
-                padding: 15px 20px;
-                border: 2px solid #e9ecef;
-                border-radius: 25px;
-                font-size: 16px;
-                outline: none;
-                transition: border-color 0.3s;
-            }
-            
-            .message-input:focus {
-                border-color: #667eea;
-            }
-            
-            .send-btn {
-                padding: 15px 30px;
-                background: linear-gradient(135deg, #667eea, #764ba2);
-                color: white;
-                border: none;
-                border-radius: 25px;
-                cursor: pointer;
-                font-size: 16px;
-                font-weight: 600;
-                transition: transform 0.2s;
-            }
-            
-            .send-btn:hover {
-                transform: translateY(-2px);
-            }
-            
-            .sidebar {
-                display: flex;
-                flex-direction: column;
-                gap: 20px;
-            }
-            
-            .info-card {
-                background: rgba(255,255,255,0.1);
-                backdrop-filter: blur(10px);
-                border-radius: 20px;
-                padding: 25px;
-                border: 1px solid rgba(255,255,255,0.2);
-            }
-            
-            .info-card h3 {
-                margin-bottom: 15px;
-                font-size: 1.3rem;
-            }
-            
-            .feature-list {
-                list-style: none;
-            }
-            
-            .feature-list li {
-                padding: 8px 0;
-                display: flex;
-                align-items: center;
-                gap: 10px;
-            }
-            
-            .feature-list li::before {
-                content: "🛡️";
-                font-size: 1.2rem;
-            }
-            
-            .api-endpoint {
-                background: rgba(0,0,0,0.2);
-                padding: 10px 15px;
-                border-radius: 10px;
-                margin: 5px 0;
-                font-family: 'Courier New', monospace;
-                font-size: 0.9rem;
-            }
-            
-            .status-indicator {
-                display: inline-block;
-                width: 10px;
-                height: 10px;
-                background: #28a745;
-                border-radius: 50%;
-                margin-right: 8px;
-                animation: pulse 2s infinite;
-            }
-            
-            @keyframes fadeIn {
-                from { opacity: 0; transform: translateY(10px); }
-                to { opacity: 1; transform: translateY(0); }
-            }
-            
-            @keyframes pulse {
-                0%, 100% { opacity: 1; }
-                50% { opacity: 0.5; }
-            }
-            
-            @media (max-width: 768px) {
-                .main-content {
-                    grid-template-columns: 1fr;
-                }
-                
-                .header h1 {
-                    font-size: 2rem;
-                }
-            }
-            
-            .loading {
-                display: none;
-                color: #667eea;
-            }
-            
-            .loading.active {
-                display: inline;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🛡️ Cyra AI Assistant</h1>
-                <p><span class="status-indicator"></span>Your sophisticated AI-powered cybersecurity companion</p>
-            </div>
-            
-            <div class="main-content">
-                <div class="chat-section">
-                    <div class="chat-container" id="chatContainer">
-                        <div class="bot-message">
-                            <strong>Cyra:</strong> Hello! I'm Cyra, your AI cybersecurity assistant. I can help you with:
-                            <ul style="margin-top: 10px; padding-left: 20px;">
-                                <li>🔐 Generating secure passwords and passphrases</li>
-                                <li>🔍 Analyzing password strength and security</li>
-                                <li>🌐 Network security advice and best practices</li>
-                                <li>📚 Cybersecurity education and guidance</li>
-                                <li>🛠️ Security tool recommendations</li>
-                            </ul>
-                            <p style="margin-top: 15px;"><strong>Try asking:</strong> "Generate a strong password" or "How can I protect myself from phishing?"</p>
-                        </div>
-                    </div>
-                    
-                    <div class="input-container">
-                        <input type="text" class="message-input" id="messageInput" placeholder="Ask me anything about cybersecurity..." onkeypress="handleKeyPress(event)">
-                        <button class="send-btn" onclick="sendMessage()">
-                            <span id="sendText">Send</span>
-                            <span class="loading" id="loadingText">●●●</span>
-                        </button>
-                    </div>
-                </div>
-                
-                <div class="sidebar">
-                    <div class="info-card">
-                        <h3>🚀 Features</h3>
-                        <ul class="feature-list">
-                            <li>Password Generation</li>
-                            <li>Security Analysis</li>
-                            <li>Threat Education</li>
-                            <li>Best Practices</li>
-                            <li>Real-time Chat</li>
-                        </ul>
-                    </div>
-                    
-                    <div class="info-card">
-                        <h3>🔌 API Endpoints</h3>
-                        <div class="api-endpoint">POST /chat</div>
-                        <div class="api-endpoint">POST /tools/password/generate</div>
-                        <div class="api-endpoint">POST /tools/password/strength</div>
-                        <div class="api-endpoint">GET /health</div>
-                        <div class="api-endpoint">GET /docs</div>
-                    </div>
-                    
-                    <div class="info-card">
-                        <h3>📖 Quick Links</h3>
-                        <a href="/docs" style="color: white; text-decoration: none; display: block; padding: 8px 0;">📚 API Documentation</a>
-                        <a href="/health" style="color: white; text-decoration: none; display: block; padding: 8px 0;">💚 Health Check</a>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <script>
-            let isLoading = false;
-            
-            async function sendMessage() {
-                if (isLoading) return;
-                
-                const input = document.getElementById('messageInput');
-                const message = input.value.trim();
-                if (!message) return;
-                
-                setLoading(true);
-                addMessage('user', message);
-                input.value = '';
-                
-                try {
-                    const response = await fetch('/chat', {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify({ message, user_id: 'web_user' })
-                    });
-                    const data = await response.json();
-                    addMessage('bot', data.response);
-                    
-                    if (data.tool_calls && data.tool_calls.length > 0) {
-                        data.tool_calls.forEach(tool => {
-                            if (tool.result && tool.result.result) {
-                                const result = tool.result.result;
-                                if (result.password) {
-                                    addMessage('bot', `🔧 Generated password: <code style="background: #f0f0f0; padding: 2px 6px; border-radius: 4px;">${result.password}</code>`, true);
-                                }
-                                if (result.passwords) {
-                                    const passwords = result.passwords.map(p => `<code style="background: #f0f0f0; padding: 2px 6px; border-radius: 4px;">${p.password}</code> (${p.strength_level})`).join('<br>');
-                                    addMessage('bot', `🔧 Generated passwords:<br>${passwords}`, true);
-                                }
-                            }
-                        });
-                    }
-                } catch (error) {
-                    addMessage('bot', 'Sorry, I encountered an error. Please try again.');
-                } finally {
-                    setLoading(false);
-                }
-            }
-            
-            function addMessage(sender, message, isToolResult = false) {
-                const container = document.getElementById('chatContainer');
-                const messageDiv = document.createElement('div');
-                messageDiv.className = sender === 'user' ? 'message user-message' : 'message bot-message';
-                
-                if (isToolResult) {
-                    messageDiv.innerHTML = `<strong>🔧 Tool Result:</strong><br>${message}`;
-                } else {
-                    messageDiv.innerHTML = `<strong>${sender === 'user' ? 'You' : 'Cyra'}:</strong> ${message}`;
-                }
-                
-                container.appendChild(messageDiv);
-                container.scrollTop = container.scrollHeight;
-            }
-            
-            function setLoading(loading) {
-                isLoading = loading;
-                const sendText = document.getElementById('sendText');
-                const loadingText = document.getElementById('loadingText');
-                
-                if (loading) {
-                    sendText.style.display = 'none';
-                    loadingText.classList.add('active');
-                } else {
-                    sendText.style.display = 'inline';
-                    loadingText.classList.remove('active');
-                }
-            }
-            
-            function handleKeyPress(event) {
-                if (event.key === 'Enter' && !isLoading) {
-                    sendMessage();
-                }
-            }
-            
-            // Auto-focus input
-            document.getElementById('messageInput').focus();
-        </script>
-    </body>
-    </html>
-    """
+    return request.app.state.index_page.response(request)
 
-@app.post("/chat", response_model=ChatResponse)
+# ChatResponse documents the payload; the dict is returned as-is to skip re-validation
+@app.post("/chat", responses={200: {"model": ChatResponse}})
 async def chat_endpoint(request: ChatMessage):
     """Process a chat message with Cyra"""
-    try:
+    cache_key = message_cache_key(request.message)
+    result = response_cache.get(cache_key)
+    if result is None:
         result = await ai_brain.process_message(request.message, request.user_id)
-        return ChatResponse(
-            response=result["response"],
-            tool_calls=result.get("tool_calls", []),
-            conversation_id=result.get("conversation_id", 0)
-        )
-    except Exception as e:
-        logger.error(f"Chat endpoint error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        # Tool output (e.g. generated passwords) must never be replayed
+        if not result.get("tool_calls") and "error" not in result:
+            response_cache.put(cache_key, result)
+    return ORJSONResponse({
+        "response": result["response"],
+        "tool_calls": result.get("tool_calls") or (),
+        "conversation_id": result.get("conversation_id", 0),
+        "timestamp": datetime.now(timezone.utc)
+    })
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatMessage):
+    """Stream Cyra's reply as Server-Sent Events while it is generated"""
+    async def events():
+        async for event in ai_brain.stream_message(request.message, request.user_id):
+            yield b"data: " + orjson.dumps(event) + b"\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"cache-control": "no-cache", "x-accel-buffering": "no"}
+    )
 
 @app.post("/tools/password/generate")
 async def generate_password(request: PasswordRequest):
     """Generate secure passwords"""
-    try:
-        result = await tool_manager.execute_tool(
-            "generate_password",
-            request.dict(),
-            "api_user"
-        )
-        return result
-    except Exception as e:
-        logger.error(f"Password generation error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return await tool_manager.execute_tool(
+        "generate_password",
+        request.model_dump() if request.model_fields_set else _DEFAULT_PWD_KWARGS,
+        "api_user"
+    )
 
 @app.post("/tools/password/strength")
 async def check_password_strength(request: PasswordStrengthRequest):
     """Analyze password strength"""
-    try:
-        result = await tool_manager.execute_tool(
-            "assess_password_strength",
-            {"password": request.password},
-            "api_user"
-        )
-        return result
-    except Exception as e:
-        logger.error(f"Password strength check error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return await tool_manager.execute_tool(
+        "assess_password_strength",
+        {"password": request.password},
+        "api_user"
+    )
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "services": {
-            "ai_brain": ai_brain is not None,
-            "tool_manager": tool_manager is not None,
-            "speech_service": False  # Disabled for now
-        },
-        "timestamp": datetime.now(),
-        "message": "Cyra AI Assistant is running (Speech services disabled)"
-    }
+    return Response(content=request.app.state.health_body, media_type="application/json")
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: core services are initialized"""
+    if ai_brain is None or tool_manager is None:
+        return Response(status_code=503)
+    return Response(status_code=204)
 
 @app.get("/tools")
 async def list_tools():
@@ -532,23 +242,26 @@ async def list_tools():
 @app.get("/cybersecurity/advice/{topic}")
 async def get_security_advice(topic: str):
     """Get cybersecurity advice on a specific topic"""
-    try:
-        result = await tool_manager.execute_tool(
-            "get_security_advice",
-            {"topic": topic},
-            "api_user"
-        )
-        return result
-    except Exception as e:
-        logger.error(f"Security advice error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return await tool_manager.execute_tool(
+        "get_security_advice",
+        {"topic": topic},
+        "api_user"
+    )
 
 if __name__ == "__main__":
+    # Only needed when run directly; ASGI servers import the app without it
+    import uvicorn
+    
     settings = get_settings()
+    log_level = settings.log_level.lower()
     uvicorn.run(
         "app_simple:app",
         host=settings.host,
         port=settings.port,
         reload=False,  # Disable reload for direct execution
-        log_level=settings.log_level.lower()
+        workers=settings.workers,
+        # uvloop has no Windows build; fall back to the stock asyncio loop there
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        log_level=log_level
     )
@@ -0,0 +1,141 @@
+let currentTab = 'login';
+
+function switchTab(tab) {
+    currentTab = tab;
+
+    // Update tab buttons
+    document.querySelectorAll('.auth-tab').forEach(t => t.classList.remove('active'));
+    document.querySelector(`.auth-tab:${tab === 'login' ? 'first-child' : 'last-child'}`).classList.add('active');
+
+    // Update forms
+    document.querySelectorAll('.auth-form').forEach(f => f.classList.remove('active'));
+    document.getElementById(tab + 'Form').classList.add('active');
+
+    clearAlerts();
+}
+
+async function handleLogin(event) {
+    event.preventDefault();
+    const form = event.target;
+    const button = form.querySelector('.auth-button');
+    const buttonText = button.querySelector('span');
+
+    try {
+        button.classList.add('loading');
+        buttonText.style.opacity = '0';
+
+        const formData = new FormData(form);
+        const data = {
+            username: formData.get('username'),
+            password: formData.get('password')
+        };
+
+        const response = await fetch('/auth/login', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            // The session itself travels in the HttpOnly cookie set by /auth/login
+            localStorage.setItem('user', JSON.stringify(result.user));
+            showAlert('Login successful! Redirecting...', 'success');
+            setTimeout(() => window.location.href = '/chat', 1500);
+        } else {
+            showAlert(result.message, 'error');
+        }
+    } catch (error) {
+        showAlert('Login failed. Please try again.', 'error');
+    } finally {
+        button.classList.remove('loading');
+        buttonText.style.opacity = '1';
+    }
+}
+
+async function handleRegister(event) {
+    event.preventDefault();
+    const form = event.target;
+    const button = form.querySelector('.auth-button');
+    const buttonText = button.querySelector('span');
+
+    try {
+        button.classList.add('loading');
+        buttonText.style.opacity = '0';
+
+        const formData = new FormData(form);
+        const data = {
+            username: formData.get('username'),
+            email: formData.get('email'),
+            password: formData.get('password'),
+            full_name: formData.get('full_name')
+        };
+
+        const response = await fetch('/auth/register', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            showAlert(result.message, 'success');
+            setTimeout(() => switchTab('login'), 2000);
+            form.reset();
+        } else {
+            showAlert(result.message, 'error');
+        }
+    } catch (error) {
+        showAlert('Registration failed. Please try again.', 'error');
+    } finally {
+        button.classList.remove('loading');
+        buttonText.style.opacity = '1';
+    }
+}
+
+function showAlert(message, type) {
+    clearAlerts();
+    const alertContainer = document.getElementById('alertContainer');
+    const alert = document.createElement('div');
+    alert.className = `alert ${type}`;
+    alert.innerHTML = `<i class="fas fa-${type === 'success' ? 'check-circle' : 'exclamation-circle'}"></i> ${message}`;
+    alertContainer.appendChild(alert);
+
+    setTimeout(() => {
+        if (alert.parentNode) {
+            alert.style.animation = 'alertSlideIn 0.3s ease-out reverse';
+            setTimeout(() => alert.remove(), 300);
+        }
+    }, 5000);
+}
+
+function clearAlerts() {
+    document.getElementById('alertContainer').innerHTML = '';
+}
+
+function accessDemo() {
+    localStorage.setItem('demo_mode', 'true');
+    window.location.href = '/chat';
+}
+
+// Check if already logged in
+document.addEventListener('DOMContentLoaded', function() {
+    // Only someone who logged in before has a session cookie worth checking
+    if (localStorage.getItem('user')) {
+        // Verify session and redirect if valid
+        fetch('/auth/verify', { credentials: 'same-origin' })
+        .then(response => response.json())
+        .then(result => {
+            if (result.valid) {
+                window.location.href = '/chat';
+            } else {
+                localStorage.removeItem('user');
+            }
+        })
+        .catch(() => {
+            localStorage.removeItem('user');
+        });
+    }
+});
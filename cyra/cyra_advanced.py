@@ -5,20 +5,34 @@ Modern ChatGPT-like interface with voice recognition and live conversation
 import asyncio
 import logging
 import os
-import json
 import base64
+import itertools
+import sys
+import time
+from collections import deque
 from contextlib import asynccontextmanager
-from typing import List, Optional, Dict, Any
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import AsyncIterator, Iterable, Optional, Dict, Any
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+import anyio.to_thread
+import httpx
+import orjson
 import uvicorn
 
+from src.core.cache import LRUCache, conversation_cache_key
 from src.core.config import get_settings
+from src.core.rate_limit import RateLimiter
+from src.core.connections import Connection, ConnectionRegistry
+from src.core.static_page import StaticPage
 from src.core.ai_brain import AIBrain
+from src.speech.speech_service import SpeechService
+from src.speech.web_voice_service import WebVoiceService
 from src.tools.tool_manager import ToolManager
 
 # Configure logging
@@ -28,6 +42,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Static assets for the web interface
+STATIC_DIR = Path(__file__).parent / "static"
+
 # Pydantic models
 class ChatMessage(BaseModel):
     message: str
@@ -36,43 +53,122 @@ class ChatMessage(BaseModel):
     is_voice_call: bool = False  # Flag for voice call mode
 
 class VoiceMessage(BaseModel):
+    """Base64 audio for the legacy REST fallback; live audio goes over /ws as binary frames"""
     audio_data: str  # Base64 encoded audio
     user_id: str = "default_user"
     format: str = "webm"
 
+# Longest text /tts/stream will synthesize in one request
+MAX_SPEECH_CHARS = 4000
+
+class SpeechRequest(BaseModel):
+    text: str = Field(..., min_length=1, max_length=MAX_SPEECH_CHARS)
+
+class PasswordStreamRequest(BaseModel):
+    count: int = Field(10, ge=1, le=1000)
+    length: int = Field(16, ge=4, le=128)
+    include_special: bool = True
+    exclude_ambiguous: bool = False
+
 # Global instances
 ai_brain: AIBrain = None
 tool_manager: ToolManager = None
-active_connections: Dict[str, WebSocket] = {}
-conversations: Dict[str, List[Dict]] = {}
+voice_service: WebVoiceService = None
+speech_service: SpeechService = None
+active_connections = ConnectionRegistry()
+# Ids stay unique for the life of the process, unlike len(active_connections)
+_connection_ids = itertools.count()
+
+# Conversation histories, least recently used evicted first to bound memory;
+# each keeps only its most recent messages
+MAX_CONVERSATIONS = 1000
+MAX_HISTORY = 200
+conversations: LRUCache = LRUCache(maxsize=MAX_CONVERSATIONS)
+
+def format_timestamp(timestamp_ns: int) -> str:
+    """Render a stored time.time_ns() timestamp for clients"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
+
+async def get_history(conversation_id: str) -> Iterable[Dict]:
+    """Return the stored messages of a conversation, oldest first"""
+    return conversations.get(conversation_id, ())
+
+async def append_history(conversation_id: str, *messages: Dict) -> None:
+    """Append messages to a conversation, creating it if needed"""
+    history = conversations.get(conversation_id)
+    if history is None:
+        history = deque(maxlen=MAX_HISTORY)
+        conversations.put(conversation_id, history)
+    history.extend(messages)
+
+# Replies to repeated messages, keyed by voice mode and the conversation so far
+response_cache: LRUCache = LRUCache(maxsize=1024)
+
+# Per-client-IP allowance for /chat: bursts of 30, refilled at 30 per minute
+chat_limiter = RateLimiter(rate=30 / 60, capacity=30)
+
+def client_key(request: Request) -> str:
+    """Rate limit key for a request; clients without an address share one bucket"""
+    return request.client.host if request.client else "unknown"
+
+# Frames buffered per WebSocket client before reading pauses
+WS_INBOX_SIZE = 20
+
+# Concurrent AI provider calls across all clients
+AI_CONCURRENCY = 32
+ai_semaphore = asyncio.Semaphore(AI_CONCURRENCY)
+
+# Concurrent sync calls allowed in the threadpool across voice and chat traffic
+THREADPOOL_TOKENS = 200
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
-    global ai_brain, tool_manager
+    global ai_brain, tool_manager, voice_service, speech_service
     
     # Startup
     logger.info("🚀 Starting Cyra AI Assistant...")
     
+    # Sync dependencies and tool calls run through Starlette's threadpool,
+    # which AnyIO caps at 40 concurrent calls by default
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_TOKENS
+    
     try:
-        ai_brain = AIBrain()
+        # One pooled HTTP/2 client for all outbound LLM calls
+        app.state.http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=30.0
+        )
+        ai_brain = AIBrain(http_client=app.state.http)
         tool_manager = ToolManager()
+        voice_service = WebVoiceService()
+        speech_service = SpeechService()
         logger.info("✅ Core services initialized successfully")
+        
+        # Move first-use costs (tool schemas, provider TLS handshake) to boot
+        tool_manager.prime()
+        await ai_brain.warm_up()
+        
+        # Read, minify and compress the main interface once and keep it ready to serve
+        app.state.index_page = StaticPage(STATIC_DIR / "advanced" / "index.html")
             
     except Exception as e:
-        logger.error(f"❌ Failed to initialize core services: {e}")
+        logger.error("❌ Failed to initialize core services: %s", e)
         raise e
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down Cyra AI Assistant...")
+    await app.state.http.aclose()
 
 # Create FastAPI app
 app = FastAPI(
     title="Cyra AI Assistant",
     description="Advanced AI-powered cybersecurity assistant with voice capabilities",
     version="2.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -96,1046 +192,182 @@ except:
     pass
 
 @app.get("/", response_class=HTMLResponse)
-async def read_root():
+async def read_root(request: Request):
     """Serve the modern ChatGPT-like interface"""
-    return """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Cyra AI Assistant</title>
-        <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-        <style>
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            
-            body {
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-                background: #0f0f23;
-                color: #ffffff;
-                height: 100vh;
-                overflow: hidden;
-            }
-            
-            .app-container {
-                display: flex;
-                height: 100vh;
-            }
-            
-            /* Sidebar */
-            .sidebar {
-                width: 260px;
-                background: #202123;
-                border-right: 1px solid #4d4d4f;
-                display: flex;
-                flex-direction: column;
-                transition: transform 0.3s ease;
-            }
-            
-            .sidebar-header {
-                padding: 20px;
-                border-bottom: 1px solid #4d4d4f;
-            }
-            
-            .new-chat-btn {
-                width: 100%;
-                padding: 12px;
-                background: transparent;
-                border: 1px solid #4d4d4f;
-                border-radius: 8px;
-                color: #ffffff;
-                font-size: 14px;
-                cursor: pointer;
-                display: flex;
-                align-items: center;
-                gap: 10px;
-                transition: background 0.2s;
-            }
-            
-            .new-chat-btn:hover {
-                background: #40414f;
-            }
-            
-            .conversations-list {
-                flex: 1;
-                overflow-y: auto;
-                padding: 10px;
-            }
-            
-            .conversation-item {
-                padding: 12px;
-                margin: 4px 0;
-                border-radius: 8px;
-                cursor: pointer;
-                font-size: 14px;
-                color: #ececf1;
-                transition: background 0.2s;
-                position: relative;
-                white-space: nowrap;
-                overflow: hidden;
-                text-overflow: ellipsis;
-            }
-            
-            .conversation-item:hover {
-                background: #2a2b32;
-            }
-            
-            .conversation-item.active {
-                background: #40414f;
-            }
-            
-            .sidebar-footer {
-                padding: 20px;
-                border-top: 1px solid #4d4d4f;
-            }
-            
-            .user-info {
-                display: flex;
-                align-items: center;
-                gap: 10px;
-                color: #ececf1;
-                font-size: 14px;
-            }
-            
-            .user-avatar {
-                width: 32px;
-                height: 32px;
-                border-radius: 50%;
-                background: linear-gradient(135deg, #667eea, #764ba2);
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-weight: 600;
-            }
-            
-            /* Main Chat Area */
-            .main-content {
-                flex: 1;
-                display: flex;
-                flex-direction: column;
-                background: #343541;
-            }
-            
-            .chat-header {
-                padding: 15px 20px;
-                border-bottom: 1px solid #4d4d4f;
-                display: flex;
-                align-items: center;
-                justify-content: space-between;
-                background: #40414f;
-            }
-            
-            .chat-title {
-                font-size: 16px;
-                font-weight: 600;
-                color: #ffffff;
-            }
-            
-            .voice-controls {
-                display: flex;
-                gap: 10px;
-            }
-            
-            .voice-btn {
-                padding: 8px 12px;
-                border: none;
-                border-radius: 6px;
-                cursor: pointer;
-                font-size: 14px;
-                transition: all 0.2s;
-                display: flex;
-                align-items: center;
-                gap: 6px;
-            }
-            
-            .voice-btn.record {
-                background: #10a37f;
-                color: white;
-            }
-            
-            .voice-btn.record:hover {
-                background: #0d8a68;
-            }
-            
-            .voice-btn.record.recording {
-                background: #ef4444;
-                animation: pulse 1s infinite;
-            }
-            
-            .voice-btn.speak {
-                background: #6366f1;
-                color: white;
-            }
-            
-            .voice-btn.speak:hover {
-                background: #4f46e5;
-            }
-            
-            .voice-btn.live-call {
-                background: #f59e0b;
-                color: white;
-            }
-            
-            .voice-btn.live-call:hover {
-                background: #d97706;
-            }
-            
-            .voice-btn.live-call.active {
-                background: #ef4444;
-                animation: pulse 1s infinite;
-            }
-            
-            @keyframes pulse {
-                0%, 100% { transform: scale(1); }
-                50% { transform: scale(1.05); }
-            }
-            
-            .chat-messages {
-                flex: 1;
-                overflow-y: auto;
-                padding: 20px;
-                display: flex;
-                flex-direction: column;
-                gap: 20px;
-            }
-            
-            .message {
-                display: flex;
-                gap: 15px;
-                max-width: 100%;
-                animation: fadeIn 0.3s ease-in;
-            }
-            
-            .message.user {
-                flex-direction: row-reverse;
-            }
-            
-            .message-avatar {
-                width: 40px;
-                height: 40px;
-                border-radius: 50%;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-weight: 600;
-                flex-shrink: 0;
-                font-size: 16px;
-            }
-            
-            .message.user .message-avatar {
-                background: linear-gradient(135deg, #667eea, #764ba2);
-                color: white;
-            }
-            
-            .message.assistant .message-avatar {
-                background: #10a37f;
-                color: white;
-            }
-            
-            .message-content {
-                flex: 1;
-                background: #444654;
-                padding: 15px 20px;
-                border-radius: 12px;
-                position: relative;
-                max-width: 70%;
-            }
-            
-            .message.user .message-content {
-                background: #40414f;
-                text-align: right;
-            }
-            
-            .message-text {
-                line-height: 1.6;
-                color: #ececf1;
-            }
-            
-            .message-time {
-                font-size: 12px;
-                color: #8e8ea0;
-                margin-top: 8px;
-            }
-            
-            .typing-indicator {
-                display: none;
-                align-items: center;
-                gap: 15px;
-                opacity: 0.7;
-            }
-            
-            .typing-dots {
-                display: flex;
-                gap: 4px;
-            }
-            
-            .typing-dot {
-                width: 8px;
-                height: 8px;
-                border-radius: 50%;
-                background: #10a37f;
-                animation: typing 1.4s infinite ease-in-out;
-            }
-            
-            .typing-dot:nth-child(1) { animation-delay: -0.32s; }
-            .typing-dot:nth-child(2) { animation-delay: -0.16s; }
-            
-            @keyframes typing {
-                0%, 80%, 100% { transform: scale(0.8); opacity: 0.5; }
-                40% { transform: scale(1); opacity: 1; }
-            }
-            
-            /* Input Area */
-            .input-area {
-                padding: 20px;
-                border-top: 1px solid #4d4d4f;
-                background: #40414f;
-            }
-            
-            .input-container {
-                position: relative;
-                max-width: 800px;
-                margin: 0 auto;
-            }
-            
-            .message-input {
-                width: 100%;
-                min-height: 50px;
-                max-height: 150px;
-                padding: 15px 60px 15px 20px;
-                background: #343541;
-                border: 1px solid #4d4d4f;
-                border-radius: 12px;
-                color: #ffffff;
-                font-size: 16px;
-                font-family: inherit;
-                resize: none;
-                outline: none;
-                transition: border-color 0.2s;
-            }
-            
-            .message-input:focus {
-                border-color: #10a37f;
-            }
-            
-            .message-input::placeholder {
-                color: #8e8ea0;
-            }
-            
-            .send-btn {
-                position: absolute;
-                right: 10px;
-                top: 50%;
-                transform: translateY(-50%);
-                width: 40px;
-                height: 40px;
-                border: none;
-                border-radius: 8px;
-                background: #10a37f;
-                color: white;
-                cursor: pointer;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                transition: background 0.2s;
-            }
-            
-            .send-btn:hover:not(:disabled) {
-                background: #0d8a68;
-            }
-            
-            .send-btn:disabled {
-                background: #4d4d4f;
-                cursor: not-allowed;
-            }
-            
-            /* Voice Status */
-            .voice-status {
-                position: fixed;
-                bottom: 100px;
-                right: 20px;
-                background: #202123;
-                border: 1px solid #4d4d4f;
-                border-radius: 12px;
-                padding: 15px;
-                display: none;
-                align-items: center;
-                gap: 10px;
-                box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-                z-index: 1000;
-            }
-            
-            .voice-status.active {
-                display: flex;
-            }
-            
-            .voice-indicator {
-                width: 12px;
-                height: 12px;
-                border-radius: 50%;
-                background: #ef4444;
-                animation: pulse 1s infinite;
-            }
-            
-            .voice-text {
-                color: #ececf1;
-                font-size: 14px;
-            }
-            
-            /* Mobile Responsive */
-            @media (max-width: 768px) {
-                .sidebar {
-                    width: 100%;
-                    position: fixed;
-                    left: 0;
-                    top: 0;
-                    z-index: 1000;
-                    transform: translateX(-100%);
-                }
-                
-                .sidebar.open {
-                    transform: translateX(0);
-                }
-                
-                .main-content {
-                    width: 100%;
-                }
-                
-                .message-content {
-                    max-width: 85%;
-                }
-            }
-            
-            @keyframes fadeIn {
-                from { opacity: 0; transform: translateY(10px); }
-                to { opacity: 1; transform: translateY(0); }
-            }
-            
-            /* Code highlighting */
-            pre {
-                background: #2d2d2d;
-                border-radius: 8px;
-                padding: 15px;
-                overflow-x: auto;
-                margin: 10px 0;
-            }
-            
-            code {
-                background: #2d2d2d;
-                padding: 2px 6px;
-                border-radius: 4px;
-                font-family: 'Courier New', monospace;
-            }
-            
-            /* Scrollbar styling */
-            ::-webkit-scrollbar {
-                width: 8px;
-            }
-            
-            ::-webkit-scrollbar-track {
-                background: #202123;
-            }
-            
-            ::-webkit-scrollbar-thumb {
-                background: #4d4d4f;
-                border-radius: 4px;
-            }
-            
-            ::-webkit-scrollbar-thumb:hover {
-                background: #666;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="app-container">
-            <!-- Sidebar -->
-            <div class="sidebar" id="sidebar">
-                <div class="sidebar-header">
-                    <button class="new-chat-btn" onclick="startNewChat()">
-                        <i class="fas fa-plus"></i>
-                        New conversation
-                    </button>
-                </div>
-                
-                <div class="conversations-list" id="conversationsList">
-                    <!-- Conversations will be loaded here -->
-                </div>
-                
-                <div class="sidebar-footer">
-                    <div class="user-info">
-                        <div class="user-avatar">U</div>
-                        <div>
-                            <div>Cybersecurity User</div>
-                            <div style="font-size: 12px; color: #8e8ea0;">Premium Plan</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <!-- Main Content -->
-            <div class="main-content">
-                <div class="chat-header">
-                    <div class="chat-title">
-                        <i class="fas fa-shield-alt"></i>
-                        Cyra AI Assistant
-                    </div>
-                    <div class="voice-controls">
-                        <button class="voice-btn record" id="recordBtn" onclick="toggleRecording()">
-                            <i class="fas fa-microphone"></i>
-                            Record
-                        </button>
-                        <button class="voice-btn speak" id="speakBtn" onclick="toggleSpeech()">
-                            <i class="fas fa-volume-up"></i>
-                            Speech
-                        </button>
-                        <button class="voice-btn live-call" id="liveCallBtn" onclick="toggleLiveCall()">
-                            <i class="fas fa-phone"></i>
-                            Live Call
-                        </button>
-                    </div>
-                </div>
-                
-                <div class="chat-messages" id="chatMessages">
-                    <div class="message assistant">
-                        <div class="message-avatar">C</div>
-                        <div class="message-content">
-                            <div class="message-text">
-                                Hey there! 👋 I'm Cyra, your friendly cybersecurity buddy! 
-                                <br><br>
-                                I can help you with:
-                                <br>
-                                � <strong>Passwords</strong> - Generate & check them<br>
-                                �️ <strong>Security Tips</strong> - Stay safe online<br>  
-                                🎤 <strong>Voice Chat</strong> - Just talk to me!<br>
-                                📞 <strong>Live Calls</strong> - Real conversations
-                                <br><br>
-                                Try saying: <em>"Hey Cyra, make me a password!"</em> 😊
-                            </div>
-                            <div class="message-time">Just now</div>
-                        </div>
-                    </div>
-                </div>
-                
-                <div class="typing-indicator" id="typingIndicator">
-                    <div class="message-avatar" style="background: #10a37f; color: white;">C</div>
-                    <div>
-                        <div class="typing-dots">
-                            <div class="typing-dot"></div>
-                            <div class="typing-dot"></div>
-                            <div class="typing-dot"></div>
-                        </div>
-                    </div>
-                </div>
-                
-                <div class="input-area">
-                    <div class="input-container">
-                        <textarea 
-                            class="message-input" 
-                            id="messageInput" 
-                            placeholder="Message Cyra..." 
-                            rows="1"
-                            onkeydown="handleKeyDown(event)"
-                            oninput="autoResize(this)"
-                        ></textarea>
-                        <button class="send-btn" id="sendBtn" onclick="sendMessage()">
-                            <i class="fas fa-paper-plane"></i>
-                        </button>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <!-- Voice Status Indicator -->
-        <div class="voice-status" id="voiceStatus">
-            <div class="voice-indicator"></div>
-            <div class="voice-text" id="voiceStatusText">Listening...</div>
-        </div>
-        
-        <script>
-            // Global variables
-            let isRecording = false;
-            let isSpeechEnabled = false;
-            let isLiveCallActive = false;
-            let mediaRecorder = null;
-            let audioChunks = [];
-            let recognition = null;
-            let currentConversationId = null;
-            let websocket = null;
-            
-            // Initialize the application
-            document.addEventListener('DOMContentLoaded', function() {
-                initializeSpeechRecognition();
-                initializeWebSocket();
-                loadConversations();
-                focusInput();
-            });
-            
-            // WebSocket connection for real-time communication
-            function initializeWebSocket() {
-                const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-                const wsUrl = `${protocol}//${window.location.host}/ws`;
-                
-                try {
-                    websocket = new WebSocket(wsUrl);
-                    
-                    websocket.onopen = function() {
-                        console.log('WebSocket connected');
-                    };
-                    
-                    websocket.onmessage = function(event) {
-                        const data = JSON.parse(event.data);
-                        if (data.type === 'response') {
-                            addMessage('assistant', data.message);
-                            if (isSpeechEnabled) {
-                                speakText(data.message);
-                            }
-                        }
-                    };
-                    
-                    websocket.onclose = function() {
-                        console.log('WebSocket disconnected');
-                        // Attempt to reconnect after 3 seconds
-                        setTimeout(initializeWebSocket, 3000);
-                    };
-                } catch (error) {
-                    console.log('WebSocket not available, using HTTP fallback');
-                }
-            }
-            
-            // Speech Recognition Setup
-            function initializeSpeechRecognition() {
-                if ('webkitSpeechRecognition' in window || 'SpeechRecognition' in window) {
-                    const SpeechRecognition = window.SpeechRecognition || window.webkitSpeechRecognition;
-                    recognition = new SpeechRecognition();
-                    recognition.continuous = true;
-                    recognition.interimResults = true;
-                    recognition.lang = 'en-US';
-                    
-                    recognition.onresult = function(event) {
-                        let finalTranscript = '';
-                        let interimTranscript = '';
-                        
-                        for (let i = event.resultIndex; i < event.results.length; ++i) {
-                            if (event.results[i].isFinal) {
-                                finalTranscript += event.results[i][0].transcript;
-                            } else {
-                                interimTranscript += event.results[i][0].transcript;
-                            }
-                        }
-                        
-                        if (finalTranscript) {
-                            document.getElementById('messageInput').value = finalTranscript;
-                            if (isLiveCallActive) {
-                                sendMessage();
-                            }
-                        }
-                    };
-                    
-                    recognition.onerror = function(event) {
-                        console.error('Speech recognition error:', event.error);
-                        stopRecording();
-                    };
-                    
-                    recognition.onend = function() {
-                        if (isRecording || isLiveCallActive) {
-                            recognition.start(); // Restart for continuous listening
-                        }
-                    };
-                } else {
-                    console.log('Speech recognition not supported');
-                }
-            }
-            
-            // Voice Recording Functions
-            function toggleRecording() {
-                if (isRecording) {
-                    stopRecording();
-                } else {
-                    startRecording();
-                }
-            }
-            
-            function startRecording() {
-                if (!recognition) {
-                    alert('Speech recognition not supported in this browser');
-                    return;
-                }
-                
-                isRecording = true;
-                const recordBtn = document.getElementById('recordBtn');
-                recordBtn.classList.add('recording');
-                recordBtn.innerHTML = '<i class="fas fa-stop"></i> Stop';
-                
-                showVoiceStatus('Listening...');
-                recognition.start();
-            }
-            
-            function stopRecording() {
-                if (!recognition) return;
-                
-                isRecording = false;
-                const recordBtn = document.getElementById('recordBtn');
-                recordBtn.classList.remove('recording');
-                recordBtn.innerHTML = '<i class="fas fa-microphone"></i> Record';
-                
-                hideVoiceStatus();
-                recognition.stop();
-            }
-            
-            // Speech Synthesis Functions
-            function toggleSpeech() {
-                isSpeechEnabled = !isSpeechEnabled;
-                const speakBtn = document.getElementById('speakBtn');
-                
-                if (isSpeechEnabled) {
-                    speakBtn.style.background = '#ef4444';
-                    speakBtn.innerHTML = '<i class="fas fa-volume-mute"></i> Mute';
-                } else {
-                    speakBtn.style.background = '#6366f1';
-                    speakBtn.innerHTML = '<i class="fas fa-volume-up"></i> Speech';
-                }
-            }
-            
-            function speakText(text) {
-                if (!isSpeechEnabled || !('speechSynthesis' in window)) return;
-                
-                // Stop any ongoing speech
-                speechSynthesis.cancel();
-                
-                const utterance = new SpeechSynthesisUtterance(text);
-                utterance.rate = 0.9;
-                utterance.pitch = 1.1;
-                utterance.volume = 0.8;
-                
-                // Try to use a female voice
-                const voices = speechSynthesis.getVoices();
-                const femaleVoice = voices.find(voice => 
-                    voice.name.includes('Female') || 
-                    voice.name.includes('Zira') || 
-                    voice.name.includes('Aria') ||
-                    voice.gender === 'female'
-                );
-                
-                if (femaleVoice) {
-                    utterance.voice = femaleVoice;
-                }
-                
-                speechSynthesis.speak(utterance);
-            }
-            
-            // Live Call Functions
-            function toggleLiveCall() {
-                if (isLiveCallActive) {
-                    stopLiveCall();
-                } else {
-                    startLiveCall();
-                }
-            }
-            
-            function startLiveCall() {
-                if (!recognition) {
-                    alert('Speech recognition not supported in this browser');
-                    return;
-                }
-                
-                isLiveCallActive = true;
-                isSpeechEnabled = true;
-                
-                const liveCallBtn = document.getElementById('liveCallBtn');
-                liveCallBtn.classList.add('active');
-                liveCallBtn.innerHTML = '<i class="fas fa-phone-slash"></i> End Call';
-                
-                const speakBtn = document.getElementById('speakBtn');
-                speakBtn.style.background = '#ef4444';
-                speakBtn.innerHTML = '<i class="fas fa-volume-mute"></i> Mute';
-                
-                showVoiceStatus('Live call active - Speak naturally');
-                recognition.start();
-                
-                // Add system message
-                addMessage('system', '📞 Live call started. Speak naturally to Cyra.');
-            }
-            
-            function stopLiveCall() {
-                isLiveCallActive = false;
-                
-                const liveCallBtn = document.getElementById('liveCallBtn');
-                liveCallBtn.classList.remove('active');
-                liveCallBtn.innerHTML = '<i class="fas fa-phone"></i> Live Call';
-                
-                hideVoiceStatus();
-                if (recognition) {
-                    recognition.stop();
-                }
-                
-                // Add system message
-                addMessage('system', '📞 Live call ended.');
-            }
-            
-            // Voice Status Functions
-            function showVoiceStatus(text) {
-                const voiceStatus = document.getElementById('voiceStatus');
-                const voiceStatusText = document.getElementById('voiceStatusText');
-                voiceStatusText.textContent = text;
-                voiceStatus.classList.add('active');
-            }
-            
-            function hideVoiceStatus() {
-                const voiceStatus = document.getElementById('voiceStatus');
-                voiceStatus.classList.remove('active');
-            }
-            
-            // Message Functions
-            async function sendMessage() {
-                const input = document.getElementById('messageInput');
-                const message = input.value.trim();
-                
-                if (!message) return;
-                
-                // Add user message
-                addMessage('user', message);
-                input.value = '';
-                autoResize(input);
-                
-                // Show typing indicator
-                showTypingIndicator();
-                
-                try {
-                    const response = await fetch('/chat', {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify({ 
-                            message, 
-                            user_id: 'web_user',
-                            conversation_id: currentConversationId,
-                            is_voice_call: isLiveCallActive  // Pass voice call status
-                        })
-                    });
-                    
-                    const data = await response.json();
-                    
-                    // Hide typing indicator
-                    hideTypingIndicator();
-                    
-                    // Add assistant response
-                    addMessage('assistant', data.response);
-                    
-                    // Handle tool calls
-                    if (data.tool_calls && data.tool_calls.length > 0) {
-                        data.tool_calls.forEach(tool => {
-                            if (tool.result && tool.result.result) {
-                                displayToolResult(tool);
-                            }
-                        });
-                    }
-                    
-                    // Speak response if enabled
-                    if (isSpeechEnabled || isLiveCallActive) {
-                        speakText(data.response);
-                    }
-                    
-                } catch (error) {
-                    hideTypingIndicator();
-                    addMessage('assistant', 'Sorry, I encountered an error. Please try again.');
-                    console.error('Error:', error);
-                }
-                
-                focusInput();
-            }
-            
-            function addMessage(sender, content, isSystem = false) {
-                const messagesContainer = document.getElementById('chatMessages');
-                const messageDiv = document.createElement('div');
-                
-                if (isSystem || sender === 'system') {
-                    messageDiv.className = 'message system';
-                    messageDiv.innerHTML = `
-                        <div style="text-align: center; color: #8e8ea0; font-style: italic; margin: 10px 0;">
-                            ${content}
-                        </div>
-                    `;
-                } else {
-                    messageDiv.className = `message ${sender}`;
-                    const avatar = sender === 'user' ? 'U' : 'C';
-                    const time = new Date().toLocaleTimeString([], {hour: '2-digit', minute:'2-digit'});
-                    
-                    messageDiv.innerHTML = `
-                        <div class="message-avatar">${avatar}</div>
-                        <div class="message-content">
-                            <div class="message-text">${formatMessage(content)}</div>
-                            <div class="message-time">${time}</div>
-                        </div>
-                    `;
-                }
-                
-                messagesContainer.appendChild(messageDiv);
-                messagesContainer.scrollTop = messagesContainer.scrollHeight;
-            }
-            
-            function formatMessage(content) {
-                // Basic markdown-like formatting
-                content = content.replace(/\\*\\*(.*?)\\*\\*/g, '<strong>$1</strong>');
-                content = content.replace(/\\*(.*?)\\*/g, '<em>$1</em>');
-                content = content.replace(/`(.*?)`/g, '<code>$1</code>');
-                content = content.replace(/\\n/g, '<br>');
-                return content;
-            }
-            
-            function displayToolResult(tool) {
-                const result = tool.result.result;
-                let message = '';
-                
-                if (result.password) {
-                    message = `🔧 Generated password: <code>${result.password}</code><br>Strength: ${result.strength.level} (${result.strength.score}/100)`;
-                } else if (result.passwords) {
-                    message = '🔧 Generated passwords:<br>';
-                    result.passwords.forEach(p => {
-                        message += `<code>${p.password}</code> (${p.strength_level})<br>`;
-                    });
-                } else if (result.score !== undefined) {
-                    message = `🔍 Password analysis: ${result.level} (${result.score}/100)<br>Estimated crack time: ${result.estimated_crack_time}`;
-                }
-                
-                if (message) {
-                    addMessage('assistant', message);
-                }
-            }
-            
-            function showTypingIndicator() {
-                document.getElementById('typingIndicator').style.display = 'flex';
-                const messagesContainer = document.getElementById('chatMessages');
-                messagesContainer.scrollTop = messagesContainer.scrollHeight;
-            }
-            
-            function hideTypingIndicator() {
-                document.getElementById('typingIndicator').style.display = 'none';
-            }
-            
-            // Input Handling
-            function handleKeyDown(event) {
-                if (event.key === 'Enter' && !event.shiftKey) {
-                    event.preventDefault();
-                    sendMessage();
-                }
-            }
-            
-            function autoResize(textarea) {
-                textarea.style.height = 'auto';
-                textarea.style.height = Math.min(textarea.scrollHeight, 150) + 'px';
-            }
-            
-            function focusInput() {
-                document.getElementById('messageInput').focus();
-            }
-            
-            // Conversation Management
-            function startNewChat() {
-                currentConversationId = Date.now().toString();
-                document.getElementById('chatMessages').innerHTML = '';
-                
-                // Add welcome message
-                addMessage('assistant', `Hey there! 👋 I'm Cyra, your friendly cybersecurity buddy!
+    return request.app.state.index_page.response(request)
 
-I can help you with:
-🔐 **Passwords** - Generate & check them
-🛡️ **Security Tips** - Stay safe online  
-🎤 **Voice Chat** - Just talk to me!
-📞 **Live Calls** - Real conversations
+async def ask_ai(message: str, user_id: str, is_voice_call: bool = False) -> Dict[str, Any]:
+    """Process a message with the AI brain, capping concurrent provider calls"""
+    async with ai_semaphore:
+        return await ai_brain.process_message(message, user_id, is_voice_call=is_voice_call)
 
-Try saying: *"Hey Cyra, make me a password!"* 😊`);
-                
-                focusInput();
-            }
-            
-            function loadConversations() {
-                // Placeholder for conversation history
-                const conversationsList = document.getElementById('conversationsList');
-                conversationsList.innerHTML = `
-                    <div class="conversation-item active">
-                        <i class="fas fa-comments" style="margin-right: 8px;"></i>
-                        New Conversation
-                    </div>
-                `;
-            }
-            
-            // Initialize voices when available
-            if ('speechSynthesis' in window) {
-                speechSynthesis.onvoiceschanged = function() {
-                    // Voices are now loaded
-                };
-            }
-        </script>
-    </body>
-    </html>
+async def stream_reply(
+    message: str,
+    user_id: str,
+    conversation_id: Optional[str],
+    is_voice_call: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream a reply as client frames: "delta" chunks, then one "done".
+    Both turns are recorded when the message belongs to a conversation.
     """
+    if conversation_id:
+        await append_history(conversation_id, {"role": "user", "content": message, "timestamp": time.time_ns()})
+    
+    events: asyncio.Queue = asyncio.Queue()
+    
+    async def pump() -> None:
+        # Only reading the provider stream holds an AI slot; events are
+        # buffered here so a slow reader cannot keep the slot busy
+        try:
+            async with ai_semaphore:
+                async for event in ai_brain.stream_message(message, user_id, is_voice_call):
+                    events.put_nowait(event)
+        finally:
+            events.put_nowait(None)
+    
+    reply_parts = []
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            if "delta" in event:
+                reply_parts.append(event["delta"])
+                yield {"type": "delta", "chunk": event["delta"]}
+            else:
+                yield {"type": "done", "tool_calls": event["tool_calls"]}
+        # Surface a provider error instead of ending the reply silently
+        await task
+    finally:
+        task.cancel()
+    
+    if conversation_id:
+        await append_history(
+            conversation_id,
+            {"role": "assistant", "content": "".join(reply_parts), "timestamp": time.time_ns()}
+        )
+
+async def handle_ws_frame(connection: Connection, user_id: str, frame: Dict[str, Any]) -> None:
+    """Process one frame received from a WebSocket client"""
+    # Binary frames carry recorded audio as-is, without base64 or JSON wrapping
+    if frame.get("bytes") is not None:
+        transcription = await voice_service.process_audio_bytes(frame["bytes"])
+        connection.send(orjson.dumps({"type": "transcription", **transcription}).decode())
+        return
+    
+    message_data = orjson.loads(frame["text"])
+    
+    message = message_data.get("message", "")
+    conversation_id = message_data.get("conversation_id")
+    
+    # Check if this is a voice call mode message
+    is_voice_call = message_data.get("is_voice_call", False)
+    
+    # Text frames keep JSON.parse(event.data) working in the browser
+    async for event in stream_reply(message, user_id, conversation_id, is_voice_call):
+        connection.send(orjson.dumps(event).decode())
+
+async def ws_worker(connection: Connection, user_id: str, inbox: asyncio.Queue) -> None:
+    """Handle a client's frames one at a time, in the order they arrived"""
+    while True:
+        frame = await inbox.get()
+        try:
+            await handle_ws_frame(connection, user_id, frame)
+        except Exception as e:
+            logger.error("WebSocket frame error for %s: %s", user_id, e)
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time communication"""
+    # Browsers always send Origin; only pages served by this host may connect
+    origin = websocket.headers.get("origin")
+    if origin is not None and urlsplit(origin).netloc != websocket.headers.get("host"):
+        await websocket.close(code=1008)
+        return
+    
     await websocket.accept()
-    user_id = f"ws_user_{len(active_connections)}"
-    active_connections[user_id] = websocket
+    user_id = f"ws_user_{next(_connection_ids)}"
+    connection = Connection(websocket)
+    # Register before starting the writer, so a rejected id leaves no task behind
+    active_connections.add(user_id, connection)
+    connection.start()
+    
+    # A full inbox makes the receive loop wait, pushing back on fast clients
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=WS_INBOX_SIZE)
+    worker = asyncio.create_task(ws_worker(connection, user_id, inbox))
     
     try:
         while True:
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
-            
-            # Check if this is a voice call mode message
-            is_voice_call = message_data.get("is_voice_call", False)
-            
-            result = await ai_brain.process_message(
-                message_data.get("message", ""),
-                user_id,
-                is_voice_call=is_voice_call
-            )
-            
-            await websocket.send_text(json.dumps({
-                "type": "response",
-                "message": result["response"],
-                "tool_calls": result.get("tool_calls", [])
-            }))
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            await inbox.put(frame)
             
     except WebSocketDisconnect:
-        if user_id in active_connections:
-            del active_connections[user_id]
-        logger.info(f"WebSocket client {user_id} disconnected")
+        logger.info("WebSocket client %s disconnected", user_id)
+    finally:
+        worker.cancel()
+        active_connections.pop(user_id, connection)
+        await connection.close()
 
 @app.post("/chat")
-async def chat_endpoint(request: ChatMessage):
+async def chat_endpoint(request: ChatMessage, http_request: Request):
     """Process a chat message with Cyra"""
+    if not chat_limiter.allow(client_key(http_request)):
+        raise HTTPException(status_code=429, detail="Too many requests, please slow down")
+    
     try:
-        result = await ai_brain.process_message(
-            request.message, 
-            request.user_id, 
-            is_voice_call=request.is_voice_call
-        )
+        now = time.time_ns()
+        history = await get_history(request.conversation_id) if request.conversation_id else ()
+        cache_key = (request.is_voice_call, conversation_cache_key(history, request.message))
+        result = response_cache.get(cache_key)
+        if result is None:
+            result = await ask_ai(request.message, request.user_id, request.is_voice_call)
+            # Tool output (e.g. generated passwords) must never be replayed
+            if not result.get("tool_calls") and "error" not in result:
+                response_cache.put(cache_key, result)
         
         # Store conversation
         if request.conversation_id:
-            if request.conversation_id not in conversations:
-                conversations[request.conversation_id] = []
-            
-            conversations[request.conversation_id].extend([
-                {"role": "user", "content": request.message, "timestamp": datetime.now().isoformat()},
-                {"role": "assistant", "content": result["response"], "timestamp": datetime.now().isoformat()}
-            ])
+            await append_history(
+                request.conversation_id,
+                {"role": "user", "content": request.message, "timestamp": now},
+                {"role": "assistant", "content": result["response"], "timestamp": now}
+            )
         
         return {
             "response": result["response"],
             "tool_calls": result.get("tool_calls", []),
             "conversation_id": result.get("conversation_id", 0),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": format_timestamp(now)
         }
     except Exception as e:
-        logger.error(f"Chat endpoint error: {e}")
+        logger.error("Chat endpoint error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/voice/process")
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatMessage, http_request: Request):
+    """Stream Cyra's reply as Server-Sent Events, using the same frames as /ws"""
+    if not chat_limiter.allow(client_key(http_request)):
+        raise HTTPException(status_code=429, detail="Too many requests, please slow down")
+    
+    async def events():
+        seq = 0
+        async for event in stream_reply(
+            request.message, request.user_id, request.conversation_id, request.is_voice_call
+        ):
+            seq += 1
+            yield b"id: %d\ndata: %s\n\n" % (seq, orjson.dumps(event))
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"cache-control": "no-cache", "x-accel-buffering": "no"}
+    )
+
+@app.post("/voice/process", deprecated=True)
 async def process_voice(request: VoiceMessage):
     """Process voice input and return text response"""
     try:
@@ -1152,16 +384,47 @@ async def process_voice(request: VoiceMessage):
             "audio_url": None
         }
     except Exception as e:
-        logger.error(f"Voice processing error: {e}")
+        logger.error("Voice processing error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/tts/stream")
+async def stream_speech(request: SpeechRequest, http_request: Request):
+    """Stream synthesized MP3 audio for a reply, one sentence at a time"""
+    # Synthesis spends Azure Speech quota, so it shares the chat allowance
+    if not chat_limiter.allow(client_key(http_request)):
+        raise HTTPException(status_code=429, detail="Too many requests, please slow down")
+    if speech_service is None or not speech_service.is_available:
+        raise HTTPException(status_code=503, detail="Speech synthesis not available")
+    return StreamingResponse(speech_service.text_to_speech_stream(request.text), media_type="audio/mpeg")
+
+@app.post("/passwords/stream")
+async def stream_passwords(request: PasswordStreamRequest):
+    """Stream generated passwords as NDJSON so clients can render each one as it arrives"""
+    generator = tool_manager.password_generator
+
+    async def lines():
+        for _ in range(request.count):
+            password = generator.generate_password(
+                length=request.length,
+                include_special=request.include_special,
+                exclude_ambiguous=request.exclude_ambiguous
+            )
+            strength = generator.assess_password_strength(password)
+            yield orjson.dumps({
+                "password": password,
+                "strength_score": strength.score,
+                "strength_level": strength.level
+            }) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @app.get("/conversations/{conversation_id}")
 async def get_conversation(conversation_id: str):
     """Get conversation history"""
-    if conversation_id in conversations:
-        return {"conversation": conversations[conversation_id]}
-    else:
-        return {"conversation": []}
+    return {"conversation": [
+        {**entry, "timestamp": format_timestamp(entry["timestamp"])}
+        for entry in await get_history(conversation_id)
+    ]}
 
 @app.get("/health")
 async def health_check():
@@ -1191,5 +454,11 @@ if __name__ == "__main__":
         host=settings.host,
         port=8004,  # Use different port
         reload=False,
+        # uvloop has no Windows build; fall back to the stock asyncio loop there
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        ws="websockets",
+        # Chat frames are small JSON; compressing each one costs more than it saves
+        ws_per_message_deflate=False,
         log_level=settings.log_level.lower()
     )
@@ -7,23 +7,33 @@ Professional live chat with login/registration system
 import asyncio
 import logging
 import os
-import json
 import base64
+import itertools
+import sys
+from collections import deque
 from contextlib import asynccontextmanager
-from typing import List, Optional, Dict, Any
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Response, Cookie, Depends
+from pathlib import Path
+from typing import Annotated, Optional, Dict, Any, Set, Union
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect, Response, Cookie, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from datetime import datetime
+import orjson
 import uvicorn
 
+from src.core.cache import LRUCache, TTLCache
 from src.core.config import get_settings
+from src.core.connections import Connection
+from src.core.middleware import HealthCheckMiddleware
+from src.core.singleflight import SingleFlight
+from src.core.static_page import CachedStaticFiles, StaticPage
 from src.core.ai_brain import AIBrain
 from src.tools.tool_manager import ToolManager
 from src.auth.auth_service import AuthService
+from src.auth.signed_session import SESSION_COOKIE, SESSION_COOKIE_MAX_AGE, needs_renewal, sign_session, verify_signed
 from src.auth.models import UserRegistration, UserLogin, PreferencesUpdate
 
 # Configure logging
@@ -33,8 +43,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Static assets for the web interface
+STATIC_DIR = Path(__file__).parent / "static"
+
 # Security
 security = HTTPBearer(auto_error=False)
+BearerCredentials = Annotated[Optional[HTTPAuthorizationCredentials], Depends(security)]
 
 # Pydantic models
 class ChatMessage(BaseModel):
@@ -43,17 +57,61 @@ class ChatMessage(BaseModel):
     conversation_id: Optional[str] = None
     is_voice_call: bool = False
 
+# Built once; parses and validates a raw WebSocket frame in one pass
+ws_message_adapter = TypeAdapter(ChatMessage)
+
+# Reply to frames that fail validation; it never changes, so encode it once
+INVALID_MESSAGE_FRAME = orjson.dumps({"type": "error", "message": "Invalid message"}).decode()
+
 class VoiceMessage(BaseModel):
     audio_data: str
     user_id: str = "default_user"
     format: str = "webm"
 
+# Parts of the health payload that never change while the process runs
+HEALTH_STATIC: Dict[str, Any] = {
+    "status": "enhanced_with_auth",
+    "version": "3.1.0",
+    "features": {
+        "authentication": True,
+        "voice_sync_animations": True,
+        "zero_delay_responses": True,
+        "live_chat_enhanced": True,
+        "user_management": True
+    },
+    "message": "Cyra Enhanced with Authentication - Ready"
+}
+
 # Global instances
 ai_brain: AIBrain = None
 tool_manager: ToolManager = None
 auth_service: AuthService = None
-active_connections: Dict[str, WebSocket] = {}
-conversations: Dict[str, List[Dict]] = {}
+active_connections: Set[Connection] = set()
+# Ids stay unique for the life of the process, unlike len(active_connections)
+_connection_ids = itertools.count()
+
+# Conversation histories, least recently used evicted first to bound memory;
+# each keeps only its last 50 turns (a user and an assistant message each)
+MAX_CONVERSATIONS = 10000
+MAX_HISTORY = 100
+conversations: LRUCache = LRUCache(maxsize=MAX_CONVERSATIONS)
+
+def append_history(conversation_id: str, *messages: Dict) -> None:
+    """Append messages to a conversation, creating it if needed"""
+    # Deliberately synchronous: with no await between the lookup and the
+    # extend, concurrent chats on one conversation cannot interleave turns
+    history = conversations.get(conversation_id)
+    if history is None:
+        history = deque(maxlen=MAX_HISTORY)
+        conversations.put(conversation_id, history)
+    history.extend(messages)
+
+def load_favicon() -> Optional[bytes]:
+    """Read the favicon once at startup; None if the project ships without one"""
+    try:
+        return Path("assets/icons/favicon.ico").read_bytes()
+    except FileNotFoundError:
+        return None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -66,6 +124,11 @@ async def lifespan(app: FastAPI):
         ai_brain = AIBrain()
         tool_manager = ToolManager()
         auth_service = AuthService()
+        app.state.home_page = StaticPage(STATIC_DIR / "auth" / "index.html")
+        app.state.chat_page = StaticPage(STATIC_DIR / "auth" / "chat.html")
+        app.state.favicon = load_favicon()
+        # Build the OpenAPI schema now rather than on the first /docs visit
+        app.openapi()
         logger.info("✅ Enhanced services with authentication initialized")
         
     except Exception as e:
@@ -80,601 +143,99 @@ app = FastAPI(
     title="Cyra Enhanced with Authentication",
     description="Professional live chat with login/registration",
     version="3.1.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Explicit origins and headers let browsers cache preflights for max_age
+# seconds; a wildcard origin with credentials is also rejected by browsers
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=get_settings().cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
+)
+
+# Added last so it sits outside CORS and routing: liveness probes get a
+# pre-serialized answer, and /health/ready does the full check
+app.add_middleware(
+    HealthCheckMiddleware,
+    body=orjson.dumps({"status": HEALTH_STATIC["status"], "version": HEALTH_STATIC["version"]})
 )
 
 if os.path.exists("assets"):
-    app.mount("/assets", StaticFiles(directory="assets"), name="assets")
+    app.mount("/assets", CachedStaticFiles(directory="assets", max_age=86400), name="assets")
+
+# Recently verified sessions, so page loads and API calls within a few
+# seconds of each other share one lookup; logout drops the entry at once.
+# Keyed by the bearer token itself, as AuthService already holds the raw tokens
+session_cache: TTLCache = TTLCache(maxsize=10000, ttl=5.0)
+
+SessionCookie = Annotated[Optional[str], Cookie(alias=SESSION_COOKIE)]
+
+def set_session_cookie(response: Response, user: Dict[str, Any], session_id: str) -> None:
+    """Issue a fresh signed session cookie"""
+    settings = get_settings()
+    response.set_cookie(
+        SESSION_COOKIE,
+        sign_session(user, session_id, settings.secret_key, SESSION_COOKIE_MAX_AGE),
+        max_age=SESSION_COOKIE_MAX_AGE,
+        httponly=True,
+        # Browsers drop Secure cookies sent over plain HTTP to hosts other
+        # than localhost, so only require HTTPS in production
+        secure=settings.is_production,
+        samesite="strict"
+    )
+
+def clear_session_cookie(response: Response) -> None:
+    """Tell the browser to drop its session cookie"""
+    response.delete_cookie(SESSION_COOKIE, httponly=True, secure=get_settings().is_production, samesite="strict")
 
 # Authentication dependency
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(response: Response, credentials: BearerCredentials, sess: SessionCookie = None):
     """Get current authenticated user"""
+    # Browsers carry a signed cookie that is checked locally (only a dict
+    # lookup confirms it was not logged out); API clients send the bearer
+    # token, which is verified in full by AuthService
+    if sess:
+        session = verify_signed(sess, get_settings().secret_key)
+        if session is not None and auth_service.has_session(session["sid"]):
+            if needs_renewal(session):
+                set_session_cookie(response, session["user"], session["sid"])
+            return session["user"]
+    
     if not credentials:
         return None
     
-    session_result = auth_service.verify_session(credentials.credentials)
+    token = credentials.credentials
+    user = session_cache.get(token)
+    if user is not None:
+        return user
+    
+    session_result = auth_service.verify_session(token)
     if session_result["valid"]:
+        session_cache.put(token, session_result["user"])
         return session_result["user"]
     return None
 
+# Shared alias so every route reuses the same dependency (resolved once per request)
+CurrentUser = Annotated[Optional[dict], Depends(get_current_user)]
+
 @app.get("/", response_class=HTMLResponse)
-async def get_homepage():
+async def get_homepage(request: Request):
     """Enhanced interface with login/registration"""
-    return HTMLResponse(content=f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Cyra Enhanced - Login</title>
-        <link rel="icon" type="image/x-icon" href="/assets/icons/favicon.ico">
-        <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
-        <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-            
-            body {{
-                font-family: 'Inter', sans-serif;
-                background: linear-gradient(135deg, #0f0f23 0%, #1a1a2e 50%, #16213e 100%);
-                color: #ffffff;
-                overflow: hidden;
-                height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-            }}
-            
-            .auth-container {{
-                width: 100%;
-                max-width: 480px;
-                background: rgba(15, 15, 35, 0.98);
-                backdrop-filter: blur(25px);
-                border: 1px solid rgba(255, 255, 255, 0.12);
-                border-radius: 24px;
-                padding: 50px 40px;
-                box-shadow: 0 20px 60px rgba(0, 0, 0, 0.4);
-                position: relative;
-                overflow: hidden;
-            }}
-            
-            .auth-container::before {{
-                content: '';
-                position: absolute;
-                top: 0;
-                left: 0;
-                right: 0;
-                height: 4px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            }}
-            
-            .logo-section {{
-                text-align: center;
-                margin-bottom: 40px;
-            }}
-            
-            .logo {{
-                display: inline-flex;
-                align-items: center;
-                gap: 15px;
-                margin-bottom: 15px;
-            }}
-            
-            .logo-icon {{
-                width: 60px;
-                height: 60px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                border-radius: 20px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 32px;
-                font-weight: bold;
-                box-shadow: 0 12px 40px rgba(102, 126, 234, 0.3);
-            }}
-            
-            .logo-text {{
-                font-size: 36px;
-                font-weight: 700;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                background-clip: text;
-            }}
-            
-            .tagline {{
-                font-size: 16px;
-                color: rgba(255, 255, 255, 0.7);
-                margin-bottom: 25px;
-            }}
-            
-            .auth-tabs {{
-                display: flex;
-                background: rgba(255, 255, 255, 0.05);
-                border-radius: 14px;
-                padding: 6px;
-                margin-bottom: 35px;
-            }}
-            
-            .auth-tab {{
-                flex: 1;
-                padding: 12px 20px;
-                text-align: center;
-                border-radius: 10px;
-                cursor: pointer;
-                transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-                font-weight: 600;
-                font-size: 15px;
-            }}
-            
-            .auth-tab.active {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                box-shadow: 0 6px 20px rgba(102, 126, 234, 0.3);
-            }}
-            
-            .auth-tab:hover:not(.active) {{
-                background: rgba(255, 255, 255, 0.08);
-            }}
-            
-            .auth-form {{
-                display: none;
-            }}
-            
-            .auth-form.active {{
-                display: block;
-                animation: formSlideIn 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-            }}
-            
-            @keyframes formSlideIn {{
-                from {{ opacity: 0; transform: translateY(20px); }}
-                to {{ opacity: 1; transform: translateY(0); }}
-            }}
-            
-            .form-group {{
-                margin-bottom: 25px;
-            }}
-            
-            .form-label {{
-                display: block;
-                margin-bottom: 8px;
-                font-weight: 600;
-                color: rgba(255, 255, 255, 0.9);
-                font-size: 14px;
-            }}
-            
-            .form-input {{
-                width: 100%;
-                padding: 16px 20px;
-                background: rgba(255, 255, 255, 0.08);
-                backdrop-filter: blur(15px);
-                border: 2px solid rgba(255, 255, 255, 0.12);
-                border-radius: 14px;
-                color: #ffffff;
-                font-size: 16px;
-                font-family: inherit;
-                outline: none;
-                transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            }}
-            
-            .form-input:focus {{
-                border-color: rgba(102, 126, 234, 0.6);
-                box-shadow: 0 0 0 4px rgba(102, 126, 234, 0.15);
-                background: rgba(255, 255, 255, 0.12);
-            }}
-            
-            .form-input::placeholder {{
-                color: rgba(255, 255, 255, 0.5);
-            }}
-            
-            .auth-button {{
-                width: 100%;
-                padding: 16px 24px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                border: none;
-                border-radius: 14px;
-                color: white;
-                font-size: 16px;
-                font-weight: 600;
-                cursor: pointer;
-                transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-                box-shadow: 0 8px 30px rgba(102, 126, 234, 0.35);
-                margin-bottom: 20px;
-                position: relative;
-                overflow: hidden;
-            }}
-            
-            .auth-button::before {{
-                content: '';
-                position: absolute;
-                top: 0;
-                left: -100%;
-                width: 100%;
-                height: 100%;
-                background: linear-gradient(90deg, transparent, rgba(255,255,255,0.2), transparent);
-                transition: left 0.5s;
-            }}
-            
-            .auth-button:hover::before {{
-                left: 100%;
-            }}
-            
-            .auth-button:hover {{
-                transform: translateY(-2px);
-                box-shadow: 0 12px 40px rgba(102, 126, 234, 0.45);
-            }}
-            
-            .auth-button:disabled {{
-                background: rgba(255, 255, 255, 0.1);
-                cursor: not-allowed;
-                transform: none;
-                box-shadow: none;
-            }}
-            
-            .auth-button.loading {{
-                pointer-events: none;
-            }}
-            
-            .auth-button.loading::after {{
-                content: '';
-                position: absolute;
-                top: 50%;
-                left: 50%;
-                width: 20px;
-                height: 20px;
-                margin: -10px 0 0 -10px;
-                border: 2px solid rgba(255,255,255,0.3);
-                border-top: 2px solid #ffffff;
-                border-radius: 50%;
-                animation: spin 1s linear infinite;
-            }}
-            
-            @keyframes spin {{
-                to {{ transform: rotate(360deg); }}
-            }}
-            
-            .forgot-password {{
-                text-align: center;
-                margin-top: 20px;
-            }}
-            
-            .forgot-password a {{
-                color: rgba(102, 126, 234, 0.8);
-                text-decoration: none;
-                font-size: 14px;
-                transition: color 0.3s ease;
-            }}
-            
-            .forgot-password a:hover {{
-                color: #667eea;
-            }}
-            
-            .alert {{
-                padding: 14px 18px;
-                border-radius: 12px;
-                margin-bottom: 20px;
-                font-size: 14px;
-                font-weight: 500;
-                animation: alertSlideIn 0.3s ease-out;
-            }}
-            
-            .alert.success {{
-                background: rgba(16, 185, 129, 0.15);
-                border: 1px solid rgba(16, 185, 129, 0.3);
-                color: #6ee7b7;
-            }}
-            
-            .alert.error {{
-                background: rgba(239, 68, 68, 0.15);
-                border: 1px solid rgba(239, 68, 68, 0.3);
-                color: #fca5a5;
-            }}
-            
-            @keyframes alertSlideIn {{
-                from {{ opacity: 0; transform: translateY(-10px); }}
-                to {{ opacity: 1; transform: translateY(0); }}
-            }}
-            
-            .features-list {{
-                margin-top: 30px;
-                padding-top: 25px;
-                border-top: 1px solid rgba(255, 255, 255, 0.1);
-            }}
-            
-            .feature-item {{
-                display: flex;
-                align-items: center;
-                gap: 12px;
-                margin-bottom: 12px;
-                font-size: 14px;
-                color: rgba(255, 255, 255, 0.8);
-            }}
-            
-            .feature-icon {{
-                width: 20px;
-                height: 20px;
-                background: linear-gradient(135deg, #10b981 0%, #059669 100%);
-                border-radius: 6px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 10px;
-            }}
-            
-            .demo-access {{
-                text-align: center;
-                margin-top: 25px;
-                padding-top: 20px;
-                border-top: 1px solid rgba(255, 255, 255, 0.1);
-            }}
-            
-            .demo-button {{
-                background: rgba(255, 255, 255, 0.1);
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                color: rgba(255, 255, 255, 0.8);
-                padding: 12px 20px;
-                border-radius: 10px;
-                cursor: pointer;
-                font-size: 14px;
-                text-decoration: none;
-                display: inline-block;
-                transition: all 0.3s ease;
-            }}
-            
-            .demo-button:hover {{
-                background: rgba(255, 255, 255, 0.15);
-                color: #ffffff;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="auth-container">
-            <div class="logo-section">
-                <div class="logo">
-                    <div class="logo-icon">C</div>
-                    <div class="logo-text">Cyra</div>
-                </div>
-                <div class="tagline">AI-Powered Cybersecurity Assistant</div>
-            </div>
-            
-            <div class="auth-tabs">
-                <div class="auth-tab active" onclick="switchTab('login')">Sign In</div>
-                <div class="auth-tab" onclick="switchTab('register')">Sign Up</div>
-            </div>
-            
-            <div id="alertContainer"></div>
-            
-            <!-- Login Form -->
-            <form class="auth-form active" id="loginForm" onsubmit="handleLogin(event)">
-                <div class="form-group">
-                    <label class="form-label">Username</label>
-                    <input type="text" class="form-input" name="username" placeholder="Enter your username" required>
-                </div>
-                <div class="form-group">
-                    <label class="form-label">Password</label>
-                    <input type="password" class="form-input" name="password" placeholder="Enter your password" required>
-                </div>
-                <button type="submit" class="auth-button">
-                    <span>Sign In to Cyra</span>
-                </button>
-                <div class="forgot-password">
-                    <a href="#" onclick="showAlert('Password reset coming soon!', 'success')">Forgot Password?</a>
-                </div>
-            </form>
-            
-            <!-- Registration Form -->
-            <form class="auth-form" id="registerForm" onsubmit="handleRegister(event)">
-                <div class="form-group">
-                    <label class="form-label">Full Name</label>
-                    <input type="text" class="form-input" name="full_name" placeholder="Enter your full name">
-                </div>
-                <div class="form-group">
-                    <label class="form-label">Username</label>
-                    <input type="text" class="form-input" name="username" placeholder="Choose a username" required>
-                </div>
-                <div class="form-group">
-                    <label class="form-label">Email</label>
-                    <input type="email" class="form-input" name="email" placeholder="Enter your email" required>
-                </div>
-                <div class="form-group">
-                    <label class="form-label">Password</label>
-                    <input type="password" class="form-input" name="password" placeholder="Create a password (min 6 chars)" required minlength="6">
-                </div>
-                <button type="submit" class="auth-button">
-                    <span>Create Account</span>
-                </button>
-            </form>
-            
-            <div class="features-list">
-                <div class="feature-item">
-                    <div class="feature-icon"><i class="fas fa-shield-alt"></i></div>
-                    <span>Advanced cybersecurity assistance</span>
-                </div>
-                <div class="feature-item">
-                    <div class="feature-icon"><i class="fas fa-microphone"></i></div>
-                    <span>Voice chat with perfect sync</span>
-                </div>
-                <div class="feature-item">
-                    <div class="feature-icon"><i class="fas fa-bolt"></i></div>
-                    <span>Real-time AI responses</span>
-                </div>
-                <div class="feature-item">
-                    <div class="feature-icon"><i class="fas fa-lock"></i></div>
-                    <span>Secure password generation</span>
-                </div>
-            </div>
-            
-            <div class="demo-access">
-                <a href="#" class="demo-button" onclick="accessDemo()">
-                    <i class="fas fa-play"></i> Try Demo Mode
-                </a>
-            </div>
-        </div>
-        
-        <script>
-            let currentTab = 'login';
-            
-            function switchTab(tab) {{
-                currentTab = tab;
-                
-                // Update tab buttons
-                document.querySelectorAll('.auth-tab').forEach(t => t.classList.remove('active'));
-                document.querySelector(`.auth-tab:${{tab === 'login' ? 'first-child' : 'last-child'}}`).classList.add('active');
-                
-                // Update forms
-                document.querySelectorAll('.auth-form').forEach(f => f.classList.remove('active'));
-                document.getElementById(tab + 'Form').classList.add('active');
-                
-                clearAlerts();
-            }}
-            
-            async function handleLogin(event) {{
-                event.preventDefault();
-                const form = event.target;
-                const button = form.querySelector('.auth-button');
-                const buttonText = button.querySelector('span');
-                
-                try {{
-                    button.classList.add('loading');
-                    buttonText.style.opacity = '0';
-                    
-                    const formData = new FormData(form);
-                    const data = {{
-                        username: formData.get('username'),
-                        password: formData.get('password')
-                    }};
-                    
-                    const response = await fetch('/auth/login', {{
-                        method: 'POST',
-                        headers: {{ 'Content-Type': 'application/json' }},
-                        body: JSON.stringify(data)
-                    }});
-                    
-                    const result = await response.json();
-                    
-                    if (result.success) {{
-                        localStorage.setItem('session_token', result.session_token);
-                        localStorage.setItem('user', JSON.stringify(result.user));
-                        showAlert('Login successful! Redirecting...', 'success');
-                        setTimeout(() => window.location.href = '/chat', 1500);
-                    }} else {{
-                        showAlert(result.message, 'error');
-                    }}
-                }} catch (error) {{
-                    showAlert('Login failed. Please try again.', 'error');
-                }} finally {{
-                    button.classList.remove('loading');
-                    buttonText.style.opacity = '1';
-                }}
-            }}
-            
-            async function handleRegister(event) {{
-                event.preventDefault();
-                const form = event.target;
-                const button = form.querySelector('.auth-button');
-                const buttonText = button.querySelector('span');
-                
-                try {{
-                    button.classList.add('loading');
-                    buttonText.style.opacity = '0';
-                    
-                    const formData = new FormData(form);
-                    const data = {{
-                        username: formData.get('username'),
-                        email: formData.get('email'),
-                        password: formData.get('password'),
-                        full_name: formData.get('full_name')
-                    }};
-                    
-                    const response = await fetch('/auth/register', {{
-                        method: 'POST',
-                        headers: {{ 'Content-Type': 'application/json' }},
-                        body: JSON.stringify(data)
-                    }});
-                    
-                    const result = await response.json();
-                    
-                    if (result.success) {{
-                        showAlert(result.message, 'success');
-                        setTimeout(() => switchTab('login'), 2000);
-                        form.reset();
-                    }} else {{
-                        showAlert(result.message, 'error');
-                    }}
-                }} catch (error) {{
-                    showAlert('Registration failed. Please try again.', 'error');
-                }} finally {{
-                    button.classList.remove('loading');
-                    buttonText.style.opacity = '1';
-                }}
-            }}
-            
-            function showAlert(message, type) {{
-                clearAlerts();
-                const alertContainer = document.getElementById('alertContainer');
-                const alert = document.createElement('div');
-                alert.className = `alert ${{type}}`;
-                alert.innerHTML = `<i class="fas fa-${{type === 'success' ? 'check-circle' : 'exclamation-circle'}}"></i> ${{message}}`;
-                alertContainer.appendChild(alert);
-                
-                setTimeout(() => {{
-                    if (alert.parentNode) {{
-                        alert.style.animation = 'alertSlideIn 0.3s ease-out reverse';
-                        setTimeout(() => alert.remove(), 300);
-                    }}
-                }}, 5000);
-            }}
-            
-            function clearAlerts() {{
-                document.getElementById('alertContainer').innerHTML = '';
-            }}
-            
-            function accessDemo() {{
-                localStorage.setItem('demo_mode', 'true');
-                window.location.href = '/chat';
-            }}
-            
-            // Check if already logged in
-            document.addEventListener('DOMContentLoaded', function() {{
-                const sessionToken = localStorage.getItem('session_token');
-                if (sessionToken) {{
-                    // Verify session and redirect if valid
-                    fetch('/auth/verify', {{
-                        headers: {{ 'Authorization': `Bearer ${{sessionToken}}` }}
-                    }})
-                    .then(response => response.json())
-                    .then(result => {{
-                        if (result.valid) {{
-                            window.location.href = '/chat';
-                        }}
-                    }})
-                    .catch(() => {{
-                        localStorage.removeItem('session_token');
-                        localStorage.removeItem('user');
-                    }});
-                }}
-            }});
-        </script>
-    </body>
-    </html>
-    """)
+    return request.app.state.home_page.response(request)
 
 # Authentication endpoints
 @app.post("/auth/register")
 async def register_endpoint(user_data: UserRegistration):
     """Register new user"""
     try:
-        result = auth_service.register_user(
+        # Password hashing takes ~100 ms of CPU; keep it off the event loop
+        result = await run_in_threadpool(
+            auth_service.register_user,
             username=user_data.username,
             email=user_data.email,
             password=user_data.password,
@@ -686,20 +247,23 @@ async def register_endpoint(user_data: UserRegistration):
         raise HTTPException(status_code=500, detail="Registration failed")
 
 @app.post("/auth/login")
-async def login_endpoint(login_data: UserLogin):
+async def login_endpoint(login_data: UserLogin, response: Response):
     """Login user"""
     try:
-        result = auth_service.login_user(
+        result = await run_in_threadpool(
+            auth_service.login_user,
             username=login_data.username,
             password=login_data.password
         )
+        if result["success"]:
+            set_session_cookie(response, result["user"], result["session_token"])
         return result
     except Exception as e:
         logger.error(f"Login error: {e}")
         raise HTTPException(status_code=500, detail="Login failed")
 
 @app.get("/auth/verify")
-async def verify_session_endpoint(current_user: dict = Depends(get_current_user)):
+async def verify_session_endpoint(current_user: CurrentUser):
     """Verify user session"""
     if current_user:
         return {"valid": True, "user": current_user}
@@ -707,124 +271,149 @@ async def verify_session_endpoint(current_user: dict = Depends(get_current_user)
         return {"valid": False, "message": "Invalid session"}
 
 @app.post("/auth/logout")
-async def logout_endpoint(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def logout_endpoint(credentials: BearerCredentials, sess: SessionCookie = None):
     """Logout user"""
-    if not credentials:
-        raise HTTPException(status_code=401, detail="No session token provided")
+    # A bearer token, a session cookie or both may name sessions to end
+    tokens = set()
+    if credentials:
+        tokens.add(credentials.credentials)
+    if sess:
+        session = verify_signed(sess, get_settings().secret_key)
+        if session is not None:
+            tokens.add(session["sid"])
     
-    result = auth_service.logout_user(credentials.credentials)
-    return result
+    if tokens:
+        for token in tokens:
+            session_cache.pop(token)
+        results = [auth_service.logout_user(token) for token in tokens]
+        response = ORJSONResponse(next((r for r in results if r["success"]), results[0]))
+    else:
+        response = ORJSONResponse({"detail": "No session token provided"}, status_code=401)
+    # Clear the cookie whatever happened, so a stale one does not linger
+    clear_session_cookie(response)
+    return response
 
 @app.get("/chat", response_class=HTMLResponse)
-async def get_chat_interface(current_user: dict = Depends(get_current_user)):
+async def get_chat_interface(request: Request, current_user: CurrentUser):
     """Chat interface - requires authentication or demo mode"""
     # For now, allow demo mode access
-    return HTMLResponse(content=f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Cyra Enhanced - Chat</title>
-        <script>
-            // Check authentication
-            const sessionToken = localStorage.getItem('session_token');
-            const demoMode = localStorage.getItem('demo_mode');
-            
-            if (!sessionToken && !demoMode) {{
-                window.location.href = '/';
-            }}
-        </script>
-    </head>
-    <body>
-        <script>
-            // Redirect to enhanced chat interface
-            window.location.href = '/enhanced';
-        </script>
-    </body>
-    </html>
-    """)
-
-@app.get("/enhanced", response_class=HTMLResponse)  
+    return request.app.state.chat_page.response(request)
+
+ENHANCED_PLACEHOLDER_BYTES = b"Enhanced chat interface will be loaded here..."
+
+@app.get("/enhanced", response_class=HTMLResponse)
 async def get_enhanced_chat():
     """Enhanced chat interface"""
     # Return the existing enhanced chat interface
     # (This would be the same content from cyra_enhanced.py but with auth integration)
-    return HTMLResponse(content="Enhanced chat interface will be loaded here...")
+    return HTMLResponse(content=ENHANCED_PLACEHOLDER_BYTES)
+
+# Identical prompts from one user that arrive while the first is still being
+# answered (double submits, retries) share that answer
+inflight_replies = SingleFlight()
+
+async def ask_ai(message: str, user_id: str, is_voice_call: bool = False) -> Dict[str, Any]:
+    """Process a message with the AI brain, sharing identical in-flight requests"""
+    return await inflight_replies.run(
+        (user_id, is_voice_call, message),
+        lambda: ai_brain.process_message(message, user_id, is_voice_call=is_voice_call)
+    )
+
+def frame_payload(frame: Dict[str, Any]) -> Union[bytes, str]:
+    """Raw payload of a received WebSocket frame, binary or text"""
+    payload: Optional[bytes] = frame.get("bytes")
+    return payload if payload is not None else frame["text"]
+
+def response_frame(result: Dict[str, Any]) -> str:
+    """Encode an AI result as a reply frame (text, so browsers can JSON.parse it)"""
+    return orjson.dumps({
+        "type": "response",
+        "message": result["response"],
+        "tool_calls": result.get("tool_calls") or ()
+    }).decode()
 
 # Rest of the existing endpoints...
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """Enhanced WebSocket with authentication"""
     await websocket.accept()
-    user_id = f"enhanced_user_{len(active_connections)}"
-    active_connections[user_id] = websocket
+    user_id = f"enhanced_user_{next(_connection_ids)}"
+    # Replies go through the connection's writer, which sends whatever has
+    # queued up behind a slow client as one batch frame
+    connection = Connection(websocket)
+    connection.start()
+    active_connections.add(connection)
     
     try:
         while True:
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
-            
-            is_voice_call = message_data.get("is_voice_call", False)
-            
-            result = await ai_brain.process_message(
-                message_data.get("message", ""),
-                user_id,
-                is_voice_call=is_voice_call
-            )
-            
-            await websocket.send_text(json.dumps({
-                "type": "response",
-                "message": result["response"],
-                "tool_calls": result.get("tool_calls", [])
-            }))
+            # Binary frames are validated straight off the wire without a
+            # UTF-8 decode; text frames from browsers work too
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            try:
+                chat_message = ws_message_adapter.validate_json(frame_payload(frame))
+            except ValidationError as e:
+                connection.send(INVALID_MESSAGE_FRAME)
+                logger.debug(f"Rejected WebSocket frame from {user_id}: {e}")
+                continue
+            
+            result = await ask_ai(chat_message.message, user_id, chat_message.is_voice_call)
+            connection.send(response_frame(result))
             
     except WebSocketDisconnect:
-        if user_id in active_connections:
-            del active_connections[user_id]
         logger.info(f"Enhanced user {user_id} disconnected")
     except Exception as e:
         logger.error(f"Enhanced WebSocket error: {e}")
-        if user_id in active_connections:
-            del active_connections[user_id]
+    finally:
+        active_connections.discard(connection)
+        await connection.close()
 
 @app.post("/chat")
 async def chat_endpoint(request: ChatMessage):
     """Enhanced chat endpoint"""
     try:
-        result = await ai_brain.process_message(
-            request.message, 
-            request.user_id, 
-            is_voice_call=request.is_voice_call
-        )
+        result = await ask_ai(request.message, request.user_id, request.is_voice_call)
+        # One timestamp for the whole turn, stored and returned alike
+        now = datetime.now()
         
         if request.conversation_id:
-            if request.conversation_id not in conversations:
-                conversations[request.conversation_id] = []
-            
-            conversations[request.conversation_id].extend([
-                {"role": "user", "content": request.message, "timestamp": datetime.now().isoformat()},
-                {"role": "assistant", "content": result["response"], "timestamp": datetime.now().isoformat()}
-            ])
+            append_history(
+                request.conversation_id,
+                {"role": "user", "content": request.message, "timestamp": now},
+                {"role": "assistant", "content": result["response"], "timestamp": now}
+            )
         
         return {
             "response": result["response"],
             "tool_calls": result.get("tool_calls", []),
             "conversation_id": result.get("conversation_id", 0),
-            "timestamp": datetime.now().isoformat()
+            # ORJSONResponse writes datetimes as ISO 8601 itself
+            "timestamp": now
         }
     except Exception as e:
         logger.error(f"Enhanced chat error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/health")
+# The readiness body walks every user for its stats; probes within a couple
+# of seconds of each other get the same serialized answer
+health_cache: TTLCache = TTLCache(maxsize=1, ttl=2.0)
+
+@app.get("/health/ready")
 async def health_check():
-    """Enhanced health check with auth stats"""
+    """Enhanced readiness check with auth stats"""
+    body = health_cache.get("ready")
+    if body is None:
+        body = orjson.dumps(build_health())
+        health_cache.put("ready", body)
+    return Response(content=body, media_type="application/json")
+
+def build_health() -> Dict[str, Any]:
+    """Current service, connection and auth stats for the readiness check"""
     auth_stats = auth_service.get_user_stats() if auth_service else {}
     
     return {
-        "status": "enhanced_with_auth",
-        "version": "3.1.0",
+        **HEALTH_STATIC,
         "services": {
             "ai_brain": ai_brain is not None,
             "tool_manager": tool_manager is not None,
@@ -833,32 +422,36 @@ async def health_check():
             "conversations": len(conversations)
         },
         "auth_stats": auth_stats,
-        "features": {
-            "authentication": True,
-            "voice_sync_animations": True,
-            "zero_delay_responses": True,
-            "live_chat_enhanced": True,
-            "user_management": True
-        },
-        "timestamp": datetime.now(),
-        "message": "Cyra Enhanced with Authentication - Ready"
+        "timestamp": datetime.now()
     }
 
 @app.get("/favicon.ico")
-async def favicon():
+async def favicon(request: Request):
     """Serve favicon"""
-    favicon_path = "assets/icons/favicon.ico"
-    if os.path.exists(favicon_path):
-        return FileResponse(favicon_path)
-    else:
+    icon = request.app.state.favicon
+    if icon is None:
         return Response(status_code=204)
+    return Response(content=icon, media_type="image/x-icon", headers={"cache-control": "public, max-age=86400"})
 
 if __name__ == "__main__":
     settings = get_settings()
+    # Development keeps access logs and proxy/Date/Server headers; production
+    # drops that per-request work
+    production = settings.is_production
     uvicorn.run(
         "cyra_auth:app",
         host=settings.host,
         port=8008,
         reload=False,
+        # Sessions, conversations and WebSocket clients live in each worker's
+        # memory, so keep WORKERS=1 unless clients stick to one process
+        workers=settings.workers,
+        # uvloop has no Windows build; fall back to the stock asyncio loop there
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        access_log=not production,
+        proxy_headers=not production,
+        server_header=not production,
+        date_header=not production,
         log_level=settings.log_level.lower()
     )
@@ -97,7 +97,9 @@ async def get_homepage():
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Cyra Enhanced Live Chat</title>
         <link rel="icon" type="image/x-icon" href="/assets/icons/favicon.ico">
-        <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
+        <!-- Icon font is not needed for first paint; load it without blocking render -->
+        <link rel="preload" as="style" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" onload="this.onload=null;this.rel='stylesheet'">
+        <noscript><link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css"></noscript>
         <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
         <style>
             * {{
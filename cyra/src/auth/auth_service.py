@@ -8,6 +8,7 @@ import hashlib
 import secrets
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import logging
@@ -18,6 +19,9 @@ class AuthService:
     def __init__(self):
         self.users_file = "data/users.json"
         self.sessions_file = "data/sessions.json"
+        # Registration and login run in worker threads; this guards the
+        # users/sessions dicts and their files
+        self._lock = threading.RLock()
         self.ensure_data_directory()
         self.load_users()
         self.load_sessions()
@@ -42,7 +46,7 @@ class AuthService:
     def save_users(self):
         """Save users to file"""
         try:
-            with open(self.users_file, 'w') as f:
+            with self._lock, open(self.users_file, 'w') as f:
                 json.dump(self.users, f, indent=2)
             logger.info("✅ Users saved successfully")
         except Exception as e:
@@ -64,7 +68,7 @@ class AuthService:
     def save_sessions(self):
         """Save sessions to file"""
         try:
-            with open(self.sessions_file, 'w') as f:
+            with self._lock, open(self.sessions_file, 'w') as f:
                 json.dump(self.sessions, f, indent=2)
         except Exception as e:
             logger.error(f"❌ Error saving sessions: {e}")
@@ -107,14 +111,7 @@ class AuthService:
             if "@" not in email:
                 return {"success": False, "message": "Invalid email format"}
             
-            # Check if user already exists
-            if username.lower() in [u.lower() for u in self.users.keys()]:
-                return {"success": False, "message": "Username already exists"}
-            
-            if any(user.get("email", "").lower() == email.lower() for user in self.users.values()):
-                return {"success": False, "message": "Email already registered"}
-            
-            # Hash password
+            # Hash password (slow on purpose, so done before taking the lock)
             password_hash, salt = self.hash_password(password)
             
             # Create user record
@@ -134,8 +131,16 @@ class AuthService:
                 }
             }
             
-            self.users[username] = user_data
-            self.save_users()
+            with self._lock:
+                # Check if user already exists
+                if username.lower() in [u.lower() for u in self.users.keys()]:
+                    return {"success": False, "message": "Username already exists"}
+                
+                if any(user.get("email", "").lower() == email.lower() for user in self.users.values()):
+                    return {"success": False, "message": "Email already registered"}
+                
+                self.users[username] = user_data
+                self.save_users()
             
             logger.info(f"✅ User {username} registered successfully")
             return {
@@ -153,7 +158,7 @@ class AuthService:
         try:
             # Find user (case-insensitive)
             user_key = None
-            for key in self.users.keys():
+            for key in list(self.users):
                 if key.lower() == username.lower():
                     user_key = key
                     break
@@ -181,12 +186,13 @@ class AuthService:
                 "user_agent": "Cyra Enhanced"
             }
             
-            self.sessions[session_token] = session_data
-            self.save_sessions()
-            
-            # Update last login
-            self.users[user_key]["last_login"] = datetime.now().isoformat()
-            self.save_users()
+            with self._lock:
+                self.sessions[session_token] = session_data
+                self.save_sessions()
+                
+                # Update last login
+                self.users[user_key]["last_login"] = datetime.now().isoformat()
+                self.save_users()
             
             logger.info(f"✅ User {username} logged in successfully")
             return {
@@ -216,8 +222,9 @@ class AuthService:
             
             if datetime.now() > expires_at:
                 # Session expired
-                del self.sessions[session_token]
-                self.save_sessions()
+                with self._lock:
+                    self.sessions.pop(session_token, None)
+                    self.save_sessions()
                 return {"valid": False, "message": "Session expired"}
             
             username = session["username"]
@@ -239,13 +246,19 @@ class AuthService:
             logger.error(f"❌ Session verification error: {e}")
             return {"valid": False, "message": "Session verification failed"}
     
+    def has_session(self, session_token: str) -> bool:
+        """Whether a session token is still active (not logged out)"""
+        return session_token in self.sessions
+    
     def logout_user(self, session_token: str) -> Dict[str, Any]:
         """Logout user and invalidate session"""
         try:
-            if session_token in self.sessions:
-                username = self.sessions[session_token]["username"]
-                del self.sessions[session_token]
-                self.save_sessions()
+            with self._lock:
+                session = self.sessions.pop(session_token, None)
+                if session is not None:
+                    self.save_sessions()
+            if session is not None:
+                username = session["username"]
                 logger.info(f"✅ User {username} logged out")
                 return {"success": True, "message": "Logged out successfully"}
             else:
@@ -260,8 +273,9 @@ class AuthService:
             if username not in self.users:
                 return {"success": False, "message": "User not found"}
             
-            self.users[username]["preferences"].update(preferences)
-            self.save_users()
+            with self._lock:
+                self.users[username]["preferences"].update(preferences)
+                self.save_users()
             
             return {"success": True, "message": "Preferences updated"}
         except Exception as e:
@@ -0,0 +1,74 @@
+"""
+Signed session cookies for Cyra Enhanced
+========================================
+
+A short-lived cookie carrying the logged-in user, their AuthService
+session token, an expiry and an HMAC-SHA256 signature, so requests from the
+browser can be authenticated without verifying the session in AuthService
+"""
+import base64
+import hashlib
+import hmac
+import time
+from typing import Any, Callable, Dict, Optional
+
+import orjson
+
+SESSION_COOKIE = "sess"
+SESSION_COOKIE_MAX_AGE = 3600
+# Cookies used with less than this many seconds left are re-issued, so an
+# active browser stays logged in for as long as its AuthService session
+SESSION_COOKIE_RENEW_WITHIN = SESSION_COOKIE_MAX_AGE // 2
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signature(payload: str, secret: str) -> str:
+    digest = hmac.new(secret.encode(), payload.encode(), hashlib.sha256).digest()
+    return _b64encode(digest)
+
+
+def sign_session(
+    user: Dict[str, Any],
+    session_id: str,
+    secret: str,
+    max_age: int = SESSION_COOKIE_MAX_AGE,
+    clock: Callable[[], float] = time.time
+) -> str:
+    """Return a ``payload.signature`` token for ``user`` that expires after ``max_age`` seconds"""
+    payload = _b64encode(orjson.dumps({"user": user, "sid": session_id, "exp": int(clock()) + max_age}))
+    return f"{payload}.{_signature(payload, secret)}"
+
+
+def verify_signed(
+    token: str,
+    secret: str,
+    clock: Callable[[], float] = time.time
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the signed session (``user`` and ``sid``) from a token, or None
+    if it is forged, malformed or expired
+    """
+    payload, _, signature = token.partition(".")
+    # Cookies are client input; compare bytes so non-ASCII garbage is just a mismatch
+    expected = _signature(payload, secret).encode()
+    if not signature or not hmac.compare_digest(signature.encode(), expected):
+        return None
+    try:
+        data = orjson.loads(_b64decode(payload))
+    except (ValueError, orjson.JSONDecodeError):
+        return None
+    if data["exp"] <= clock():
+        return None
+    return data
+
+
+def needs_renewal(session: Dict[str, Any], clock: Callable[[], float] = time.time) -> bool:
+    """Whether a verified session is close enough to expiry to be re-issued"""
+    return session["exp"] - clock() < SESSION_COOKIE_RENEW_WITHIN
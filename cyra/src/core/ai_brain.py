@@ -4,7 +4,8 @@ AI Brain - Core conversational AI powered by Azure OpenAI
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+import httpx
 from openai import AsyncAzureOpenAI
 from src.core.config import get_settings
 from src.tools.tool_manager import ToolManager
@@ -15,12 +16,15 @@ logger = logging.getLogger(__name__)
 class AIBrain:
     """Core AI brain for Cyra assistant"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.settings = get_settings()
+        # A shared http_client lets the app pool connections to Azure OpenAI
+        # across the process instead of per AIBrain instance
         self.client = AsyncAzureOpenAI(
             azure_endpoint=self.settings.azure_openai_endpoint,
             api_key=self.settings.azure_openai_api_key,
-            api_version=self.settings.azure_openai_api_version
+            api_version=self.settings.azure_openai_api_version,
+            http_client=http_client
         )
         self.tool_manager = ToolManager()
         self.conversation_history: List[Dict[str, str]] = []
@@ -52,14 +56,29 @@ Your tools: password generation, security analysis, network scanning, vulnerabil
 Always be helpful, but keep it simple and friendly! 🚀
 """
 
-    async def process_message(self, message: str, user_id: str, is_voice_call: bool = False) -> Dict[str, Any]:
+    async def warm_up(self) -> None:
         """
-        Process a user message and return AI response with potential tool calls
+        Prime tool definitions and open a pooled connection to Azure OpenAI
+        before the first user request. Failures are logged, not raised, so
+        the app still starts while the provider is unreachable.
         """
+        self.tool_manager.prime()
         try:
-            # Adjust system prompt for voice call mode
-            if is_voice_call:
-                voice_prompt = self.system_prompt + """
+            await self.client.with_options(max_retries=0, timeout=10.0).chat.completions.create(
+                model=self.settings.azure_openai_deployment_name,
+                messages=[{"role": "user", "content": "ping"}],
+                max_tokens=1
+            )
+        except Exception as e:
+            logger.warning("AI brain warm-up failed: %s", e)
+    
+    def _prepare_request(self, message: str, is_voice_call: bool) -> Dict[str, Any]:
+        """
+        Record the user message and build the chat completion arguments
+        """
+        # Adjust system prompt for voice call mode
+        if is_voice_call:
+            voice_prompt = self.system_prompt + """
 
 VOICE CALL MODE ACTIVE:
 - Keep responses to 1-2 sentences MAX
@@ -69,59 +88,78 @@ VOICE CALL MODE ACTIVE:
 - Be super friendly and quick
 - Perfect for natural conversation flow
 """
-            else:
-                voice_prompt = self.system_prompt
+        else:
+            voice_prompt = self.system_prompt
+        
+        # Add user message to conversation history
+        self.conversation_history.append({
+            "role": "user",
+            "content": message
+        })
+        
+        # Prepare messages for API call
+        messages = [
+            {"role": "system", "content": voice_prompt},
+            *self.conversation_history[-10:]  # Keep last 10 messages for context
+        ]
+        
+        # Get available tools for function calling
+        tools = self.tool_manager.get_openai_tools()
+        
+        # Adjust parameters for voice mode
+        max_tokens = 100 if is_voice_call else 500  # Shorter responses for voice
+        temperature = 0.8 if is_voice_call else 0.7  # More natural for voice
+        
+        return {
+            "model": self.settings.azure_openai_deployment_name,
+            "messages": messages,
+            "tools": tools if tools else None,
+            "tool_choice": "auto" if tools else None,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+    
+    async def _run_tool_calls(self, tool_calls: List[Tuple[str, str, str]], user_id: str) -> List[Dict[str, Any]]:
+        """
+        Execute (call_id, name, json_arguments) tool calls requested by the model
+        """
+        tool_results = []
+        for call_id, name, arguments in tool_calls:
+            tool_result = await self.tool_manager.execute_tool(
+                name,
+                json.loads(arguments) if arguments else {},
+                user_id
+            )
+            tool_results.append({
+                "tool_name": name,
+                "result": tool_result
+            })
             
-            # Add user message to conversation history
+            # Add tool result to conversation for follow-up
             self.conversation_history.append({
-                "role": "user",
-                "content": message
+                "role": "tool",
+                "content": f"Tool {name} executed: {tool_result}",
+                "tool_call_id": call_id
             })
-            
-            # Prepare messages for API call
-            messages = [
-                {"role": "system", "content": voice_prompt},
-                *self.conversation_history[-10:]  # Keep last 10 messages for context
-            ]
-            
-            # Get available tools for function calling
-            tools = self.tool_manager.get_openai_tools()
-            
-            # Adjust parameters for voice mode
-            max_tokens = 100 if is_voice_call else 500  # Shorter responses for voice
-            temperature = 0.8 if is_voice_call else 0.7  # More natural for voice
-            
+        return tool_results
+    
+    async def process_message(self, message: str, user_id: str, is_voice_call: bool = False) -> Dict[str, Any]:
+        """
+        Process a user message and return AI response with potential tool calls
+        """
+        try:
             response = await self.client.chat.completions.create(
-                model=self.settings.azure_openai_deployment_name,
-                messages=messages,
-                tools=tools if tools else None,
-                tool_choice="auto" if tools else None,
-                temperature=temperature,
-                max_tokens=max_tokens
+                **self._prepare_request(message, is_voice_call)
             )
             
             assistant_message = response.choices[0].message
             
             # Handle tool calls if present
-            tool_results = []
-            if assistant_message.tool_calls:
-                for tool_call in assistant_message.tool_calls:
-                    tool_result = await self.tool_manager.execute_tool(
-                        tool_call.function.name,
-                        json.loads(tool_call.function.arguments),
-                        user_id
-                    )
-                    tool_results.append({
-                        "tool_name": tool_call.function.name,
-                        "result": tool_result
-                    })
-                    
-                    # Add tool result to conversation for follow-up
-                    self.conversation_history.append({
-                        "role": "tool",
-                        "content": f"Tool {tool_call.function.name} executed: {tool_result}",
-                        "tool_call_id": tool_call.id
-                    })
+            tool_results = await self._run_tool_calls(
+                [(call.id, call.function.name, call.function.arguments)
+                 for call in assistant_message.tool_calls or ()],
+                user_id
+            )
             
             # Add assistant response to history
             self.conversation_history.append({
@@ -143,6 +181,60 @@ VOICE CALL MODE ACTIVE:
                 "error": str(e)
             }
     
+    async def stream_message(self, message: str, user_id: str, is_voice_call: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the reply to a user message as it is generated.
+        
+        Yields {"delta": text} events while the model writes, followed by one
+        final {"tool_calls": [...], "conversation_id": n} event once any tools
+        the model asked for have run.
+        """
+        content_parts: List[str] = []
+        pending_calls: Dict[int, Dict[str, str]] = {}
+        try:
+            stream = await self.client.chat.completions.create(
+                **self._prepare_request(message, is_voice_call),
+                stream=True
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue  # Azure sends content-filter chunks without choices
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content_parts.append(delta.content)
+                    yield {"delta": delta.content}
+                # Tool calls arrive in fragments keyed by their index
+                for call in delta.tool_calls or ():
+                    entry = pending_calls.setdefault(call.index, {"id": "", "name": "", "arguments": ""})
+                    if call.id:
+                        entry["id"] = call.id
+                    if call.function:
+                        entry["name"] += call.function.name or ""
+                        entry["arguments"] += call.function.arguments or ""
+            
+            tool_results = await self._run_tool_calls(
+                [(c["id"], c["name"], c["arguments"]) for _, c in sorted(pending_calls.items())],
+                user_id
+            )
+            
+            # Add assistant response to history
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": "".join(content_parts)
+            })
+            
+            yield {
+                "tool_calls": tool_results,
+                "conversation_id": len(self.conversation_history)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error streaming message: {str(e)}")
+            yield {
+                "delta": "I apologize, but I encountered an error processing your request. Please try again."
+            }
+            yield {"tool_calls": [], "error": str(e)}
+    
     async def get_cybersecurity_advice(self, topic: str) -> str:
         """
         Get specific cybersecurity advice on a topic
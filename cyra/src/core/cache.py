@@ -0,0 +1,95 @@
+"""
+In-process caches for Cyra AI Assistant
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry when full"""
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value and mark it as recently used"""
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the oldest entry if the cache is full"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Remove and return a cached value"""
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache(LRUCache):
+    """LRU cache whose entries also expire ``ttl`` seconds after they are stored"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.clock = clock
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value if it has not expired yet"""
+        entry = super().get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if self.clock() >= expires_at:
+            super().pop(key)
+            return default
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value for ``ttl`` seconds"""
+        super().put(key, (value, self.clock() + self.ttl))
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Remove and return a cached value, expired or not"""
+        entry = super().pop(key)
+        return default if entry is None else entry[0]
+
+
+def message_cache_key(message: str) -> bytes:
+    """Normalize a chat message into a compact cache key"""
+    return hashlib.blake2b(message.strip().lower().encode("utf-8"), digest_size=16).digest()
+
+
+def conversation_cache_key(history: Sequence[Dict[str, Any]], message: str) -> bytes:
+    """Key a chat message together with the conversation that led up to it"""
+    digest = hashlib.blake2b(digest_size=16)
+    for entry in history:
+        digest.update(entry.get("role", "").encode("utf-8") + b"\0")
+        digest.update(entry.get("content", "").encode("utf-8") + b"\0")
+    digest.update(message.strip().lower().encode("utf-8"))
+    return digest.digest()
+
+
+def speech_cache_key(text: str, voice: str) -> bytes:
+    """Key synthesized audio by its exact text and the voice that spoke it"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16, key=voice.encode("utf-8")).digest()
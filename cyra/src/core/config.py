@@ -2,7 +2,8 @@
 Configuration management for Cyra AI Assistant
 """
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
@@ -16,11 +17,17 @@ class Settings(BaseSettings):
     debug: bool = Field(default=False, env="DEBUG")
     host: str = Field(default="localhost", env="HOST")
     port: int = Field(default=8000, env="PORT")
+    workers: int = Field(default=1, env="WORKERS")
+    cyra_env: str = Field(default="development", env="CYRA_ENV")
     
     # Security
     secret_key: str = Field(..., env="SECRET_KEY")
     algorithm: str = Field(default="HS256", env="ALGORITHM")
     access_token_expire_minutes: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    # Browser origins allowed to call the API from other sites (JSON list)
+    cors_origins: List[str] = Field(
+        default=["http://localhost:8008", "http://127.0.0.1:8008"], env="CORS_ORIGINS"
+    )
     
     # Database
     database_url: str = Field(default="sqlite:///./cyra.db", env="DATABASE_URL")
@@ -39,15 +46,21 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     log_file: str = Field(default="logs/cyra.log", env="LOG_FILE")
     
+    @property
+    def is_production(self) -> bool:
+        """Whether the app runs with production settings (CYRA_ENV=prod)"""
+        return self.cyra_env.lower() in ("prod", "production")
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get application settings (parsed from the environment once)"""
+    return Settings()
 
 
-def get_settings() -> Settings:
-    """Get application settings"""
-    return settings
+# Global settings instance
+settings = get_settings()
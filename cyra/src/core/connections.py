@@ -0,0 +1,130 @@
+"""
+WebSocket connection tracking for Cyra AI Assistant
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from starlette.websockets import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Outbound messages buffered per client before new ones are dropped
+OUTBOX_SIZE = 64
+
+# Number of dicts the connection registry spreads clients over (a power of two)
+REGISTRY_SHARDS = 16
+
+
+@dataclass(eq=False)
+class Connection:
+    """
+    A WebSocket client with its own bounded outbound queue and writer task.
+    Connections compare and hash by identity, so they can be kept in sets.
+
+    Messages are JSON text. When several are waiting, the writer sends them
+    as one {"type": "batch", "items": [...]} frame.
+    """
+    websocket: WebSocket
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=OUTBOX_SIZE))
+    writer: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start draining the outbound queue onto the socket"""
+        self.writer = asyncio.create_task(self._write())
+
+    async def _write(self) -> None:
+        while True:
+            # Block for the first message, then take whatever else is already waiting
+            messages = [await self.queue.get()]
+            while not self.queue.empty():
+                messages.append(self.queue.get_nowait())
+            
+            if len(messages) == 1:
+                frame = messages[0]
+            else:
+                frame = '{"type":"batch","items":[' + ",".join(messages) + "]}"
+            try:
+                await self.websocket.send_text(frame)
+            except Exception as e:
+                logger.debug("Stopped writing to WebSocket client: %s", e)
+                return
+
+    def send(self, message: str) -> bool:
+        """Queue a message without waiting; returns False if the client is too far behind"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def close(self) -> None:
+        """Stop the writer task"""
+        if self.writer is not None:
+            self.writer.cancel()
+            try:
+                await self.writer
+            except asyncio.CancelledError:
+                pass
+
+
+def broadcast(connections: Iterable[Connection], message: str) -> int:
+    """Queue a message for every connection; returns how many clients it was dropped for"""
+    dropped = 0
+    for connection in connections:
+        if not connection.send(message):
+            dropped += 1
+    return dropped
+
+
+class ConnectionRegistry:
+    """
+    Active connections keyed by client id, spread over several small dicts.
+
+    Keeping each shard small means adding or removing a client only ever
+    resizes one little table instead of a single large one. The number of
+    clients is kept as a running count, so reading it never walks the shards.
+    """
+
+    def __init__(self, shards: int = REGISTRY_SHARDS):
+        if shards < 1 or shards & (shards - 1):
+            raise ValueError("shards must be a power of two")
+        self._mask = shards - 1
+        self._shards: List[Dict[str, Connection]] = [{} for _ in range(shards)]
+        self._count = 0
+
+    def _shard(self, client_id: str) -> Dict[str, Connection]:
+        return self._shards[hash(client_id) & self._mask]
+
+    def add(self, client_id: str, connection: Connection) -> None:
+        """Register a client's connection; a live client id cannot be reused"""
+        shard = self._shard(client_id)
+        if client_id in shard:
+            raise ValueError(f"client id {client_id!r} is already connected")
+        shard[client_id] = connection
+        self._count += 1
+
+    def get(self, client_id: str) -> Optional[Connection]:
+        """Return a client's connection, if it is still open"""
+        return self._shard(client_id).get(client_id)
+
+    def pop(self, client_id: str, connection: Optional[Connection] = None) -> Optional[Connection]:
+        """
+        Forget a client's connection. When ``connection`` is given, the entry
+        is only removed if it is still that connection.
+        """
+        shard = self._shard(client_id)
+        current = shard.get(client_id)
+        if current is None or (connection is not None and current is not connection):
+            return None
+        del shard[client_id]
+        self._count -= 1
+        return current
+
+    def __iter__(self) -> Iterator[Connection]:
+        for shard in self._shards:
+            yield from list(shard.values())
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,82 @@
+"""
+ASGI middleware for Cyra AI Assistant
+
+These are written as plain ASGI callables rather than with
+``@app.middleware("http")`` / ``BaseHTTPMiddleware``, which wrap every request
+in an extra task and re-buffer the body through a memory stream.
+"""
+import time
+from typing import Any, Awaitable, Callable, Dict, Sequence, Tuple
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class ServerTimingMiddleware:
+    """Report the time spent producing each HTTP response in a Server-Timing header"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"server-timing", b"app;dur=%.2f" % elapsed_ms),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+class HealthCheckMiddleware:
+    """
+    Answer liveness probes for ``path`` with a fixed JSON body before the
+    request reaches any other middleware, routing or dependency injection.
+
+    Only GET and HEAD are accepted; anything else gets a 405. Checks that
+    need to look at the services belong on a regular route.
+    """
+
+    ALLOWED_METHODS = ("GET", "HEAD")
+
+    def __init__(self, app: ASGIApp, body: bytes, path: str = "/health"):
+        self.app = app
+        self.path = path
+        self.body = body
+        self.headers: Sequence[Tuple[bytes, bytes]] = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"cache-control", b"no-store"),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] not in self.ALLOWED_METHODS:
+            await send({
+                "type": "http.response.start",
+                "status": 405,
+                "headers": [(b"allow", b"GET, HEAD"), (b"content-length", b"0")],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({"type": "http.response.start", "status": 200, "headers": self.headers})
+        await send({
+            "type": "http.response.body",
+            "body": self.body if scope["method"] == "GET" else b"",
+        })
@@ -0,0 +1,39 @@
+"""
+Request rate limiting for Cyra AI Assistant
+"""
+import time
+from typing import Callable, Hashable
+
+from .cache import LRUCache
+
+
+class RateLimiter:
+    """
+    Token bucket per key (e.g. client IP).
+
+    Each key may burst up to ``capacity`` requests and then gets ``rate``
+    new requests per second. Buckets for the least recently seen keys are
+    dropped once ``max_keys`` is reached, which only ever lets a forgotten
+    client start again with a full bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._buckets = LRUCache(maxsize=max_keys)
+
+    def allow(self, key: Hashable) -> bool:
+        """Take a token for ``key``; returns False if its bucket is empty"""
+        now = self.clock()
+        tokens, last = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self.rate)
+        allowed = tokens >= 1
+        self._buckets.put(key, (tokens - 1 if allowed else tokens, now))
+        return allowed
@@ -0,0 +1,35 @@
+"""
+Request coalescing for Cyra AI Assistant
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Share one in-flight call among concurrent callers that use the same key.
+
+    Only calls that overlap in time are shared; once a call finishes, the
+    next caller with that key starts a fresh one, so no result outlives the
+    request that produced it.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``func()``, or the identical call already running for ``key``"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # One caller giving up must not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,95 @@
+"""
+Helpers for serving the prebuilt web interface pages
+"""
+import gzip
+import hashlib
+import re
+import os
+from pathlib import Path
+from typing import Dict
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+# Elements whose contents are whitespace-sensitive and must be left untouched
+_PRESERVED_BLOCK = re.compile(rb"(<(pre|textarea|script|style)\b.*?</\2\s*>)", re.IGNORECASE | re.DOTALL)
+_COMMENT = re.compile(rb"<!--(?!\[if).*?-->", re.DOTALL)
+_WHITESPACE = re.compile(rb"\s+")
+
+
+def minify_html(html: bytes) -> bytes:
+    """
+    Strip comments and collapse whitespace runs in an HTML document.
+
+    Browsers render any run of whitespace as a single space, so this changes
+    the payload size but not the rendered page. Pre, textarea, script and
+    style blocks are kept verbatim.
+    """
+    parts = _PRESERVED_BLOCK.split(html)
+    out = []
+    # split() yields [text, block, tag name, text, block, tag name, ...]
+    for i in range(0, len(parts), 3):
+        text = _COMMENT.sub(b"", parts[i])
+        out.append(_WHITESPACE.sub(b" ", text))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return b"".join(out).strip()
+
+
+class StaticPage:
+    """
+    An HTML page read and minified once, held in memory precompressed in
+    every content encoding the server supports, and revalidated by ETag
+    """
+
+    def __init__(self, path: Path, max_age: int = 300):
+        body = minify_html(path.read_bytes())
+        self.bodies: Dict[str, bytes] = {"gzip": gzip.compress(body, 9)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body, quality=11)
+        self.identity = body
+        self.headers = {
+            "etag": f'"{hashlib.blake2b(body).hexdigest()[:16]}"',
+            "cache-control": f"public, max-age={max_age}",
+            "vary": "accept-encoding",
+        }
+
+    def response(self, request: Request) -> Response:
+        """Return the page in the best encoding the client accepts, or 304 if it is unchanged"""
+        if request.headers.get("if-none-match") == self.headers["etag"]:
+            return Response(status_code=304, headers=self.headers)
+        accept = request.headers.get("accept-encoding", "")
+        for encoding in ("br", "gzip"):
+            if encoding in accept and encoding in self.bodies:
+                return Response(
+                    content=self.bodies[encoding],
+                    media_type="text/html",
+                    headers={**self.headers, "content-encoding": encoding}
+                )
+        return Response(content=self.identity, media_type="text/html", headers=self.headers)
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that lets browsers keep what it serves for ``max_age``
+    seconds, after which the ETag and Last-Modified headers StaticFiles
+    already sends let them revalidate with a cheap 304
+    """
+
+    def __init__(self, *args, max_age: int = 86400, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = f"public, max-age={max_age}"
+
+    def file_response(
+        self, full_path: "os.PathLike[str]", stat_result: os.stat_result, scope: Scope, status_code: int = 200
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["cache-control"] = self.cache_control
+        return response
@@ -3,9 +3,11 @@ Speech Service - Handle text-to-speech and speech-to-text using Azure Speech Ser
 """
 import asyncio
 import logging
+import re
 import tempfile
 import wave
-from typing import Optional, AsyncGenerator
+from typing import Optional, AsyncGenerator, List
+from xml.sax.saxutils import escape
 
 try:
     import azure.cognitiveservices.speech as speechsdk
@@ -16,16 +18,33 @@ except (ImportError, FileNotFoundError, OSError) as e:
     import logging
     logging.getLogger(__name__).warning(f"Azure Speech SDK not available: {e}")
 
+from src.core.cache import LRUCache, speech_cache_key
 from src.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Sentence ends: ., ! or ? (optionally followed by a closing quote) and whitespace
+_SENTENCE_END = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]]))\s+')
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences so speech can start before the whole reply is synthesized"""
+    return [sentence for sentence in (s.strip() for s in _SENTENCE_END.split(text)) if sentence]
+
+
+# Voice used for all synthesized speech
+VOICE_NAME = "en-US-AriaNeural"
+
+# Synthesized clips kept for repeated phrases (greetings, error messages, tool prefixes)
+AUDIO_CACHE_SIZE = 256
+
 
 class SpeechService:
     """Handle speech-to-text and text-to-speech operations"""
     
     def __init__(self):
         self.settings = get_settings()
+        self._audio_cache = LRUCache(maxsize=AUDIO_CACHE_SIZE)
         
         if not AZURE_SPEECH_AVAILABLE:
             logger.warning("Azure Speech Services not available. Speech features will be disabled.")
@@ -39,7 +58,7 @@ class SpeechService:
             )
             
             # Configure voice settings for a professional, friendly female voice
-            self.speech_config.speech_synthesis_voice_name = "en-US-AriaNeural"
+            self.speech_config.speech_synthesis_voice_name = VOICE_NAME
             self.speech_config.speech_recognition_language = "en-US"
             
             # Configure for high quality audio
@@ -57,27 +76,36 @@ class SpeechService:
         if not AZURE_SPEECH_AVAILABLE or not self.speech_config:
             logger.warning("Speech synthesis not available")
             return None
+        
+        cache_key = speech_cache_key(text, VOICE_NAME)
+        audio = self._audio_cache.get(cache_key)
+        if audio is not None:
+            return audio
             
         try:
             # Create a synthesizer
             synthesizer = speechsdk.SpeechSynthesizer(speech_config=self.speech_config, audio_config=None)
             
-            # Use SSML for better voice control
+            # Use SSML for better voice control; the text is escaped so "&" or
+            # "<" in a reply (or a generated password) cannot break or alter the markup
             ssml_text = f"""
             <speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="en-US">
-                <voice name="en-US-AriaNeural">
+                <voice name="{VOICE_NAME}">
                     <prosody rate="0.9" pitch="+2Hz">
-                        {text}
+                        {escape(text)}
                     </prosody>
                 </voice>
             </speak>
             """
             
-            # Synthesize speech
-            result = synthesizer.speak_ssml_async(ssml_text).get()
+            # Synthesize speech; the SDK call blocks, so wait for it off the event loop
+            result = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: synthesizer.speak_ssml_async(ssml_text).get()
+            )
             
             if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
                 logger.info("Speech synthesis completed successfully")
+                self._audio_cache.put(cache_key, result.audio_data)
                 return result.audio_data
             elif result.reason == speechsdk.ResultReason.Canceled:
                 cancellation_details = result.cancellation_details
@@ -90,6 +118,32 @@ class SpeechService:
             logger.error(f"Error in text-to-speech: {str(e)}")
             return None
     
+    @property
+    def is_available(self) -> bool:
+        """Whether speech synthesis is configured"""
+        return AZURE_SPEECH_AVAILABLE and self.speech_config is not None
+    
+    async def text_to_speech_stream(self, text: str) -> AsyncGenerator[bytes, None]:
+        """
+        Synthesize text sentence by sentence, yielding MP3 audio for each
+        sentence as soon as it is ready. The next sentence is synthesized
+        while the current one is being sent and played.
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            return
+        ahead = asyncio.ensure_future(self.text_to_speech(sentences[0]))
+        try:
+            for next_sentence in sentences[1:] + [None]:
+                audio = await ahead
+                if next_sentence is not None:
+                    ahead = asyncio.ensure_future(self.text_to_speech(next_sentence))
+                if audio:
+                    yield audio
+        finally:
+            # Client went away mid-reply: don't keep synthesizing for nobody
+            ahead.cancel()
+    
     async def speech_to_text_continuous(self) -> AsyncGenerator[str, None]:
         """
         Continuous speech recognition that yields recognized text
@@ -33,8 +33,19 @@ class WebVoiceService:
         """
         try:
             # Decode base64 audio data
-            audio_bytes = base64.b64decode(audio_data)
-            
+            return await self.process_audio_bytes(base64.b64decode(audio_data), format)
+        except Exception as e:
+            logger.error(f"Audio processing error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    async def process_audio_bytes(self, audio_bytes: bytes, format: str = "webm") -> Dict[str, Any]:
+        """
+        Process raw audio received from the browser, e.g. a binary WebSocket frame
+        """
+        try:
             # Placeholder for actual speech-to-text processing
             # In production, integrate with Azure Speech Services or Google Speech API
             
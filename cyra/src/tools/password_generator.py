@@ -26,6 +26,36 @@ class PasswordGenerator:
         self.digits = string.digits
         self.special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
         self.ambiguous_chars = "0O1lI"  # Characters that might be confused
+        self._charset_cache: Dict[tuple, str] = {}
+    
+    def _build_charset(
+        self,
+        include_uppercase: bool,
+        include_lowercase: bool,
+        include_digits: bool,
+        include_special: bool,
+        exclude_ambiguous: bool
+    ) -> str:
+        """Build (once per combination of options) the character set to draw from"""
+        key = (include_uppercase, include_lowercase, include_digits, include_special, exclude_ambiguous)
+        charset = self._charset_cache.get(key)
+        if charset is None:
+            charset = ""
+            if include_lowercase:
+                charset += self.lowercase
+            if include_uppercase:
+                charset += self.uppercase
+            if include_digits:
+                charset += self.digits
+            if include_special:
+                charset += self.special_chars
+            
+            # Remove ambiguous characters if requested
+            if exclude_ambiguous:
+                for char in self.ambiguous_chars:
+                    charset = charset.replace(char, "")
+            self._charset_cache[key] = charset
+        return charset
     
     def generate_password(
         self,
@@ -59,24 +89,13 @@ class PasswordGenerator:
         if custom_charset:
             charset = custom_charset
         else:
-            charset = ""
-            if include_lowercase:
-                charset += self.lowercase
-            if include_uppercase:
-                charset += self.uppercase
-            if include_digits:
-                charset += self.digits
-            if include_special:
-                charset += self.special_chars
+            charset = self._build_charset(
+                include_uppercase, include_lowercase, include_digits, include_special, exclude_ambiguous
+            )
         
         if not charset:
             raise ValueError("At least one character type must be included")
         
-        # Remove ambiguous characters if requested
-        if exclude_ambiguous and not custom_charset:
-            for char in self.ambiguous_chars:
-                charset = charset.replace(char, "")
-        
         # Generate password ensuring at least one character from each selected type
         password = []
         
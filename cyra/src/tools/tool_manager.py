@@ -24,10 +24,26 @@ class ToolManager:
             "port_scan": self._port_scan,
             "get_security_advice": self._get_security_advice,
         }
+        self._openai_tools: Optional[List[Dict[str, Any]]] = None
+    
+    def prime(self) -> None:
+        """
+        Build the one-time tool state up front so the first request doesn't pay for it
+        """
+        self.get_openai_tools()
+        self.password_generator.generate_password()
     
     def get_openai_tools(self) -> List[Dict[str, Any]]:
         """
-        Get tool definitions for OpenAI function calling
+        Get tool definitions for OpenAI function calling (built once, then shared)
+        """
+        if self._openai_tools is None:
+            self._openai_tools = self._build_openai_tools()
+        return self._openai_tools
+    
+    def _build_openai_tools(self) -> List[Dict[str, Any]]:
+        """
+        Build the tool definitions for OpenAI function calling
         """
         return [
             {
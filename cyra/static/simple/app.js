@@ -0,0 +1,110 @@
+let isLoading = false;
+
+async function sendMessage() {
+    if (isLoading) return;
+
+    const input = document.getElementById('messageInput');
+    const message = input.value.trim();
+    if (!message) return;
+
+    setLoading(true);
+    addMessage('user', message);
+    input.value = '';
+
+    try {
+        const response = await fetch('/chat/stream', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ message, user_id: 'web_user' })
+        });
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+        // Render the reply as it streams in; text is appended, never parsed as HTML
+        const reply = document.createElement('span');
+        addMessage('bot', '').appendChild(reply);
+        const container = document.getElementById('chatContainer');
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                if (!frame.startsWith('data: ')) continue;
+
+                const event = JSON.parse(frame.slice(6));
+                if (event.delta) {
+                    reply.textContent += event.delta;
+                    container.scrollTop = container.scrollHeight;
+                }
+                if (event.tool_calls) {
+                    showToolCalls(event.tool_calls);
+                }
+            }
+        }
+    } catch (error) {
+        addMessage('bot', 'Sorry, I encountered an error. Please try again.');
+    } finally {
+        setLoading(false);
+    }
+}
+
+function showToolCalls(toolCalls) {
+    toolCalls.forEach(tool => {
+        if (tool.result && tool.result.result) {
+            const result = tool.result.result;
+            if (result.password) {
+                addMessage('bot', `🔧 Generated password: <code style="background: #f0f0f0; padding: 2px 6px; border-radius: 4px;">${result.password}</code>`, true);
+            }
+            if (result.passwords) {
+                const passwords = result.passwords.map(p => `<code style="background: #f0f0f0; padding: 2px 6px; border-radius: 4px;">${p.password}</code> (${p.strength_level})`).join('<br>');
+                addMessage('bot', `🔧 Generated passwords:<br>${passwords}`, true);
+            }
+        }
+    });
+}
+
+function addMessage(sender, message, isToolResult = false) {
+    const container = document.getElementById('chatContainer');
+    const messageDiv = document.createElement('div');
+    messageDiv.className = sender === 'user' ? 'message user-message' : 'message bot-message';
+
+    if (isToolResult) {
+        messageDiv.innerHTML = `<strong>🔧 Tool Result:</strong><br>${message}`;
+    } else {
+        messageDiv.innerHTML = `<strong>${sender === 'user' ? 'You' : 'Cyra'}:</strong> ${message}`;
+    }
+
+    container.appendChild(messageDiv);
+    container.scrollTop = container.scrollHeight;
+    return messageDiv;
+}
+
+function setLoading(loading) {
+    isLoading = loading;
+    const sendText = document.getElementById('sendText');
+    const loadingText = document.getElementById('loadingText');
+
+    if (loading) {
+        sendText.style.display = 'none';
+        loadingText.classList.add('active');
+    } else {
+        sendText.style.display = 'inline';
+        loadingText.classList.remove('active');
+    }
+}
+
+function handleKeyPress(event) {
+    if (event.key === 'Enter' && !isLoading) {
+        sendMessage();
+    }
+}
+
+// Auto-focus input
+document.getElementById('messageInput').focus();
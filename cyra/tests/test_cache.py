@@ -0,0 +1,71 @@
+"""
+Test in-process cache helpers
+"""
+import pytest
+from src.core.cache import LRUCache, TTLCache, conversation_cache_key, message_cache_key, speech_cache_key
+
+
+class TestLRUCache:
+    """Test cases for the LRU cache"""
+
+    def test_get_missing_returns_default(self):
+        """Test lookups of unknown keys"""
+        cache = LRUCache(maxsize=2)
+        assert cache.get("missing") is None
+        assert cache.get("missing", "fallback") == "fallback"
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted first"""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now the least recently used
+        cache.put("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert len(cache) == 2
+
+    def test_invalid_maxsize(self):
+        """Test maxsize validation"""
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_message_cache_key_normalizes(self):
+        """Test that equivalent messages share a key"""
+        assert message_cache_key("  What is Phishing? ") == message_cache_key("what is phishing?")
+        assert message_cache_key("what is phishing?") != message_cache_key("what is malware?")
+
+    def test_conversation_cache_key_depends_on_history(self):
+        """Test that the same message in different conversations gets different keys"""
+        history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+        assert conversation_cache_key([], "Make a password") == conversation_cache_key([], "make a password")
+        assert conversation_cache_key(history, "make a password") != conversation_cache_key([], "make a password")
+
+    def test_speech_cache_key_depends_on_voice(self):
+        """Test that the same text spoken by different voices gets different keys"""
+        assert speech_cache_key("Hello!", "en-US-AriaNeural") == speech_cache_key("Hello!", "en-US-AriaNeural")
+        assert speech_cache_key("Hello!", "en-US-AriaNeural") != speech_cache_key("Hello!", "en-US-GuyNeural")
+        assert speech_cache_key("Hello!", "en-US-AriaNeural") != speech_cache_key("hello!", "en-US-AriaNeural")
+
+
+class TestTTLCache:
+    """Test cases for the expiring LRU cache"""
+
+    def test_entries_expire(self):
+        """Test that a value is served until its TTL has passed"""
+        now = [0.0]
+        cache = TTLCache(maxsize=2, ttl=5.0, clock=lambda: now[0])
+        cache.put("token", {"username": "alice"})
+        now[0] = 4.9
+        assert cache.get("token") == {"username": "alice"}
+        now[0] = 5.0
+        assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_pop_returns_value(self):
+        """Test that invalidation returns the stored value, not the expiry bookkeeping"""
+        cache = TTLCache(ttl=5.0)
+        cache.put("token", "user")
+        assert cache.pop("token") == "user"
+        assert cache.pop("token", "gone") == "gone"
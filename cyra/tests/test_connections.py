@@ -0,0 +1,94 @@
+"""
+Test WebSocket connection helpers
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.core.connections import Connection, ConnectionRegistry, broadcast
+
+
+class TestConnection:
+    """Test cases for per-connection outbound queues"""
+
+    def test_writer_sends_single_messages_as_is(self):
+        """Test that a lone queued message is sent unchanged"""
+        async def run():
+            websocket = Mock(send_text=AsyncMock())
+            connection = Connection(websocket)
+            connection.start()
+            connection.send('{"n":1}')
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            await connection.close()
+            return [call.args[0] for call in websocket.send_text.await_args_list]
+
+        assert asyncio.run(run()) == ['{"n":1}']
+
+    def test_writer_batches_waiting_messages_in_order(self):
+        """Test that messages queued together go out as one batch frame"""
+        async def run():
+            websocket = Mock(send_text=AsyncMock())
+            connection = Connection(websocket)
+            connection.send('{"n":1}')
+            connection.send('{"n":2}')
+            connection.start()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            await connection.close()
+            return [json.loads(call.args[0]) for call in websocket.send_text.await_args_list]
+
+        assert asyncio.run(run()) == [{"type": "batch", "items": [{"n": 1}, {"n": 2}]}]
+
+    def test_broadcast_drops_for_full_queues(self):
+        """Test that a slow client does not block the others"""
+        async def run():
+            slow = Connection(Mock(), queue=asyncio.Queue(maxsize=1))
+            fast = Connection(Mock())
+            assert broadcast([slow, fast], "one") == 0
+            assert broadcast([slow, fast], "two") == 1
+            return fast.queue.qsize()
+
+        assert asyncio.run(run()) == 2
+
+
+class TestConnectionRegistry:
+    """Test cases for the sharded connection registry"""
+
+    def test_add_get_pop(self):
+        """Test that connections are found and counted across shards"""
+        registry = ConnectionRegistry(shards=4)
+        connections = {f"ws_user_{n}": Mock() for n in range(10)}
+        for client_id, connection in connections.items():
+            registry.add(client_id, connection)
+        assert len(registry) == 10
+        assert registry.get("ws_user_3") is connections["ws_user_3"]
+        assert set(map(id, registry)) == set(map(id, connections.values()))
+        assert registry.pop("ws_user_3") is connections["ws_user_3"]
+        assert registry.pop("ws_user_3") is None
+        assert len(registry) == 9
+
+    def test_duplicate_ids_are_rejected(self):
+        """Test that a live client id cannot be taken over by another connection"""
+        registry = ConnectionRegistry()
+        original = Mock()
+        registry.add("ws_user_1", original)
+        with pytest.raises(ValueError):
+            registry.add("ws_user_1", Mock())
+        assert len(registry) == 1
+        assert registry.get("ws_user_1") is original
+
+    def test_pop_only_removes_the_given_connection(self):
+        """Test that popping with a stale connection leaves the current one registered"""
+        registry = ConnectionRegistry()
+        current = Mock()
+        registry.add("ws_user_1", current)
+        assert registry.pop("ws_user_1", Mock()) is None
+        assert len(registry) == 1
+        assert registry.pop("ws_user_1", current) is current
+        assert len(registry) == 0
+
+    def test_shard_count_must_be_power_of_two(self):
+        """Test shard count validation"""
+        with pytest.raises(ValueError):
+            ConnectionRegistry(shards=3)
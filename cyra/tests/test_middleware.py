@@ -0,0 +1,35 @@
+"""
+Test ASGI middleware
+"""
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from src.core.middleware import HealthCheckMiddleware
+
+
+def make_client():
+    app = Starlette(routes=[Route("/health/ready", lambda request: PlainTextResponse("ready"))])
+    return TestClient(HealthCheckMiddleware(app, body=b'{"status":"ok"}'))
+
+
+class TestHealthCheckMiddleware:
+    """Test cases for the liveness probe shortcut"""
+
+    def test_answers_health_without_the_app(self):
+        """Test that GET and HEAD /health get the fixed body"""
+        client = make_client()
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+        assert client.head("/health").content == b""
+
+    def test_rejects_other_methods(self):
+        """Test that writes to /health are refused with an Allow header"""
+        response = make_client().post("/health")
+        assert response.status_code == 405
+        assert response.headers["allow"] == "GET, HEAD"
+
+    def test_passes_other_paths_through(self):
+        """Test that every other path reaches the wrapped app"""
+        assert make_client().get("/health/ready").text == "ready"
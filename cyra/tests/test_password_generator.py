@@ -40,6 +40,14 @@ class TestPasswordGenerator:
         has_digit = any(c.isdigit() for c in password)
         assert has_upper or has_lower or has_digit  # At least one type should be present
     
+    def test_charset_is_memoized(self, password_generator):
+        """Test that the character set is built once per option combination"""
+        first = password_generator._build_charset(True, True, True, False, True)
+        second = password_generator._build_charset(True, True, True, False, True)
+        assert first is second
+        assert not set(password_generator.ambiguous_chars) & set(first)
+        assert not set(password_generator.special_chars) & set(first)
+    
     def test_generate_passphrase(self, password_generator):
         """Test passphrase generation"""
         passphrase = password_generator.generate_passphrase()
@@ -0,0 +1,36 @@
+"""
+Test request rate limiting
+"""
+from src.core.rate_limit import RateLimiter
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter:
+    """Test cases for the token bucket rate limiter"""
+
+    def test_burst_then_refill(self):
+        """Test that a key can burst to capacity and then waits for refill"""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=1.0, capacity=2, clock=clock)
+        assert limiter.allow("ip")
+        assert limiter.allow("ip")
+        assert not limiter.allow("ip")
+        clock.now += 1.0
+        assert limiter.allow("ip")
+        assert not limiter.allow("ip")
+
+    def test_keys_are_independent(self):
+        """Test that one client's usage does not affect another"""
+        limiter = RateLimiter(rate=0.0, capacity=1, clock=FakeClock())
+        assert limiter.allow("a")
+        assert not limiter.allow("a")
+        assert limiter.allow("b")
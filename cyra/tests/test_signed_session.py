@@ -0,0 +1,53 @@
+"""
+Test signed session cookies
+"""
+from src.auth.signed_session import needs_renewal, sign_session, verify_signed
+
+USER = {"username": "ada", "email": "ada@example.com"}
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSignedSession:
+    """Test cases for signing and verifying session tokens"""
+
+    def test_round_trip_until_expiry(self):
+        """Test that a token verifies until its max-age runs out"""
+        clock = FakeClock()
+        token = sign_session(USER, "sid-1", "secret", max_age=60, clock=clock)
+        session = verify_signed(token, "secret", clock=clock)
+        assert session["user"] == USER
+        assert session["sid"] == "sid-1"
+        clock.now += 60
+        assert verify_signed(token, "secret", clock=clock) is None
+
+    def test_renewal_in_the_second_half_of_the_lifetime(self):
+        """Test that a session is due for renewal once half its max-age has passed"""
+        clock = FakeClock()
+        session = verify_signed(sign_session(USER, "sid-1", "secret", max_age=3600, clock=clock), "secret", clock=clock)
+        assert not needs_renewal(session, clock=clock)
+        clock.now += 1801
+        assert needs_renewal(session, clock=clock)
+
+    def test_rejects_tampering(self):
+        """Test that a wrong key, an edited payload or garbage is rejected"""
+        token = sign_session(USER, "sid-1", "secret")
+        payload, signature = token.split(".")
+        forged = sign_session({"username": "admin"}, "sid-1", "secret").split(".")[0]
+        assert verify_signed(token, "other-secret") is None
+        assert verify_signed(f"{forged}.{signature}", "secret") is None
+        assert verify_signed(payload, "secret") is None
+        assert verify_signed("not-a-token", "secret") is None
+
+    def test_rejects_non_ascii(self):
+        """Test that a cookie with non-ASCII characters is rejected, not an error"""
+        assert verify_signed("\u00e9.\u00e9", "secret") is None
+        assert verify_signed(sign_session(USER, "sid-1", "secret") + "\u00e9", "secret") is None
@@ -0,0 +1,55 @@
+"""
+Test request coalescing
+"""
+import asyncio
+from src.core.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for sharing in-flight calls"""
+
+    def test_concurrent_calls_share_one_result(self):
+        """Test that overlapping calls with the same key run once"""
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return {"response": "hi"}
+
+        async def run():
+            flight = SingleFlight()
+            first, second = await asyncio.gather(flight.run("key", work), flight.run("key", work))
+            assert len(flight) == 0
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is second
+        assert len(calls) == 1
+
+    def test_finished_calls_are_not_reused(self):
+        """Test that a later call with the same key runs again"""
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return len(calls)
+
+        async def run():
+            flight = SingleFlight()
+            return await flight.run("key", work), await flight.run("key", work)
+
+        assert asyncio.run(run()) == (1, 2)
+
+    def test_errors_reach_every_caller(self):
+        """Test that a failed call raises for all callers sharing it"""
+        async def work():
+            await asyncio.sleep(0)
+            raise RuntimeError("provider down")
+
+        async def run():
+            flight = SingleFlight()
+            return await asyncio.gather(flight.run("key", work), flight.run("key", work), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,70 @@
+"""
+Test static page helpers
+"""
+import gzip
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+from src.core.static_page import CachedStaticFiles, StaticPage, minify_html
+
+
+def make_request(**headers):
+    """Build a bare GET request with the given headers"""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+class TestMinifyHtml:
+    """Test cases for HTML minification"""
+
+    def test_collapses_whitespace_and_comments(self):
+        """Test that comments are dropped and whitespace runs collapsed"""
+        html = b"<div>\r\n    <!-- note -->\r\n    <p>Hello   there</p>\r\n</div>\r\n"
+        assert minify_html(html) == b"<div> <p>Hello there</p> </div>"
+
+    def test_preserves_whitespace_sensitive_blocks(self):
+        """Test that pre and script contents are kept verbatim"""
+        html = b"<pre>a\n  b</pre>\n\n<script>\n  let x = 1;  // <!-- keep -->\n</script>"
+        assert minify_html(html) == b"<pre>a\n  b</pre> <script>\n  let x = 1;  // <!-- keep -->\n</script>"
+
+
+class TestStaticPage:
+    """Test cases for precompressed static pages"""
+
+    def test_negotiates_encoding(self, tmp_path):
+        """Test that gzip is served only to clients that accept it"""
+        path = tmp_path / "index.html"
+        path.write_bytes(b"<p>\n  hello\n</p>")
+        page = StaticPage(path)
+        compressed = page.response(make_request(accept_encoding="gzip"))
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(compressed.body) == b"<p> hello </p>"
+        assert page.response(make_request()).body == b"<p> hello </p>"
+
+    def test_unchanged_page_returns_304(self, tmp_path):
+        """Test ETag revalidation"""
+        path = tmp_path / "index.html"
+        path.write_bytes(b"<p>hello</p>")
+        page = StaticPage(path)
+        etag = page.headers["etag"]
+        assert page.response(make_request(if_none_match=etag)).status_code == 304
+        assert page.response(make_request(if_none_match='"stale"')).status_code == 200
+
+
+
+class TestCachedStaticFiles:
+    """Test cases for static files with browser caching"""
+
+    def test_sets_cache_control(self, tmp_path):
+        """Test that served files carry the configured max-age and still revalidate"""
+        (tmp_path / "app.css").write_text("body { margin: 0; }")
+        app = Starlette(routes=[Mount("/assets", CachedStaticFiles(directory=tmp_path, max_age=600))])
+        with TestClient(app) as client:
+            response = client.get("/assets/app.css")
+            assert response.headers["cache-control"] == "public, max-age=600"
+            revalidated = client.get("/assets/app.css", headers={"if-none-match": response.headers["etag"]})
+            assert revalidated.status_code == 304